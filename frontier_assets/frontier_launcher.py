@@ -1,6 +1,31 @@
 # ==== VERSION NUMBER ====
-VERSION_NUMBER = "1.3"
+VERSION_NUMBER = "1.3.25"
 # CHANGELOG:
+# 1.3.25: no more fake progress / sleeps before launch, "fast launch" pref skips the update wait, click-to-launch time is shown
+# 1.3.24: task queue instead of "Console Busy": actions wait their turn, status/verify run alongside each other, cancel drops queued ones
+# 1.3.23: console is fed through a queue (batched, capped at CONSOLE_MAX_LINES)
+# 1.3.22: no Git installed? install, update and status still work through dulwich (pure python) if it is bundled
+# 1.3.21: git installer download is parallel, resumable, checksummed and shows progress
+# 1.3.20: real progress bar for install/update (weighted git stages, speed, ETA), throttled console output
+# 1.3.19: cancel button + stall timeout for downloads, journal so interrupted updates/installs are finished or rolled back on start
+# 1.3.18: mod changelog (added / removed / upgraded mods, changed configs) for updates
+# 1.3.17: Verify button, checks files against the release using a hash cache
+# 1.3.16: repo maintenance when idle (commit-graph, repack, prune, untracked cache)
+# 1.3.15: optional branch cache, switching to a recently used branch is a few renames
+# 1.3.14: extra instances sharing one object store, identical jars hardlinked
+# 1.3.13: mirror list, fetch from the fastest up-to-date mirror and fail over
+# 1.3.12: opt-in LAN sharing, updates come from a launcher on your network first
+# 1.3.11: install from a local seed bundle, fetch only what's newer
+# 1.3.10: remember the last version that launched without crashing, one-click rollback
+# 1.3.9: post-update hooks driven by the tree diff, no more exe hashing
+# 1.3.8: preserve mode merges settings key by key instead of stashing
+# 1.3.7: 'repair' update mode replaces 'clean'
+# 1.3.6: update size / ETA preview before pulling
+# 1.3.5: background staged updates while playing, settings dialog
+# 1.3.4: blind launch checks ref tips only, with a hard deadline
+# 1.3.3: one cached remote fetch per connect / confirm
+# 1.3.2: pick install components (sparse checkout)
+# 1.3.1: quick (shallow + partial) install mode
 # 1.3: live server status bar
 # 1.2.4: add linux default path
 # 1.2.3: add blind launch
@@ -25,9 +50,13 @@ import ctypes
 import sys
 import datetime
 import time
-import random
 import hashlib
 import json
+import fnmatch
+import queue
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 # Global Constants for Design Language
 BG_COLOR = "#c0c0c0"  # Default background color
@@ -42,6 +71,8 @@ STATUS_FG_DARK    = "#222222"
 STATUS_FG_LIGHT   = "#ffffff"
 CONSOLE_BG = "#0f0e0f"  # Console background
 CONSOLE_FG = "lime"  # Console text color
+CONSOLE_MAX_LINES = 1000  # older lines drop out of the console; every line is also in LAUNCHER_LOG_PATH (stdout)
+CONSOLE_FRAME_MS = 50  # queued console lines and bar updates are applied this often, on the Tk thread
 FONT_FAMILY = "Arial"  # Font family
 FONT_TITLE = (FONT_FAMILY, 14, "bold")
 FONT_TEXT = (FONT_FAMILY, 12)
@@ -52,8 +83,133 @@ BUTTON_WIDTH = 20
 MAIN_BRANCH_NAME = 'main'
 LAUNCHER_EXE_NAME = "FrontierLauncher.exe"
 
+# Install modes: 'quick' clones only the branch tips (depth-limited, blobs fetched on
+# checkout), 'full' clones the whole history. Quick installs stay shallow on update.
+INSTALL_MODE_QUICK = 'quick'
+INSTALL_MODE_FULL = 'full'
+SHALLOW_DEPTH = 1
+PARTIAL_CLONE_FILTER = "blob:none"
+
+# Install components -> sparse-checkout patterns. 'core' (everything else) is always
+# installed; optional components left out are never checked out (nor, on quick
+# installs, downloaded). The choice is kept in the repo's git config.
+COMPONENT_CORE = 'core'
+COMPONENT_SHADERS = 'shaders'
+COMPONENT_DEV = 'dev tooling'
+COMPONENT_LAUNCHER = 'launcher binary'
+COMPONENT_PATTERNS = {
+    COMPONENT_SHADERS: ['/shaderpacks/'],
+    COMPONENT_DEV: ['/frontier_assets/'],
+    COMPONENT_LAUNCHER: [f'/{LAUNCHER_EXE_NAME}'],
+}
+COMPONENT_DESCRIPTIONS = {
+    COMPONENT_CORE: "mods, configs, libraries, assets (required)",
+    COMPONENT_SHADERS: "shaderpacks/ (Bliss shaders)",
+    COMPONENT_DEV: "frontier_assets/ (launcher source, recipe tools)",
+    COMPONENT_LAUNCHER: f"{LAUNCHER_EXE_NAME} (windows launcher)",
+}
+
 DISCORD_BUG_WEBHOOK_URL = "https://discord.com/api/webhooks/1499623650083602575/aZUKDLC65INPUnWfuN70kDMOZRTATEPTt-9omo0nk_JbV__Td6MQ-lI38BeY-rvmS72m"
 CRASH_RECENT_WINDOW_SECS = 300          # 5 minutes
+REMOTE_CACHE_TTL_SECS = 30              # fetched remote refs count as fresh this long
+BLIND_LAUNCH_TIMEOUT_SECS = 1.5         # ls-remote deadline before blind launch just launches
+
+# Staged updates: downloaded while the game runs, swapped in on the next launch
+STAGING_DIR_NAME = "frontier-staging"           # under .git: changed files for the next launch
+STAGING_INDEX_NAME = "frontier-staging.index"   # temp index used to lay them out
+STAGING_MANIFEST_NAME = "frontier-staged.json"  # what's staged, on top of which commit
+STAGE_BATCH_SIZE = 25                           # blobs per paced download batch
+
+# Branch cache: the tracked files of recently left branches that differ from the active one, kept
+# under .git so switching back is a few file renames plus the saved index. Files the player added
+# to these folders are never moved
+BRANCH_CACHE_DIR_NAME = "frontier-branches"
+BRANCH_CACHE_DIRS = ['mods', 'tacz', 'kubejs', 'global_packs', 'libraries', 'versions']
+BRANCH_CACHE_MAX = 2                            # branches kept besides the active one
+
+# Idle maintenance: keeps status and fetch fast as objects pile up
+MAINTENANCE_IDLE_SECS = 90                      # no button pressed for this long -> run if due
+MAINTENANCE_INTERVAL_SECS = 7 * 24 * 3600
+MAINTENANCE_LOG_NAME = "frontier_maintenance.json"  # in .git: before/after timings of the last runs
+MAINTENANCE_LOG_KEEP = 10
+PRUNE_EXPIRE_DEFAULT = "2.weeks.ago"            # git gc's own default, used unless gc.pruneExpire says otherwise
+
+# Verify: (size, mtime) -> blob id cache so only files touched since the last run get hashed
+VERIFY_CACHE_NAME = "frontier_verify_cache.json"  # in .git
+VERIFY_EXTRA_DIRS = ['mods', 'libraries', 'tacz']   # untracked files here are reported as extra
+VERIFY_RACY_SECS = 2                                # files modified this recently aren't cached
+
+# Long operations (update, install) journal their steps so the next start can finish or undo them
+JOURNAL_NAME = "frontier_journal.json"          # in .git
+GIT_STALL_TIMEOUT_SECS = 120                    # a download that prints nothing for this long is killed
+
+# Progress: git's stages are folded into one bar; UI updates are rate limited
+PROGRESS_BAR_SECS = 0.1                         # at most this often for the bar
+PROGRESS_PRINT_SECS = 1.0                       # and this often for a console line
+PROGRESS_STAGE_WEIGHTS = [                      # share of a step each git stage gets, in the order git runs them
+    ('counting', 0.03), ('compressing', 0.05), ('receiving', 0.70), ('resolving', 0.12), ('checkout', 0.10),
+]
+
+# Task scheduler: button actions queue instead of bouncing off a busy launcher. Reads (status,
+# verify) run side by side, writes (install, update, launch...) run alone, free tasks don't
+# touch the repo and start right away. Lower priority numbers go first.
+TASK_READ = 'read'
+TASK_WRITE = 'write'
+TASK_FREE = 'free'
+TASK_PRIORITY_HIGH = 0
+TASK_PRIORITY_NORMAL = 1
+TASK_PRIORITY_LOW = 2
+
+UPDATE_CONFIRM_BYTES = 50 * 1024 * 1024         # ask before updates that download more than this
+THROUGHPUT_MIN_SAMPLE_BYTES = 256 * 1024        # smaller fetches are too noisy to time
+
+QUARANTINE_DIR_NAME = "frontier_quarantine"     # repair moves stray mod jars here, one dated folder per run
+DYNAMIC_PACK_DIRS = ['dynamic-resource-pack-cache']  # generated by mods at runtime, reset when mods change
+LAST_KNOWN_GOOD_REF = "refs/frontier/last-known-good"  # also keeps that commit's objects from being pruned
+PENDING_LAUNCH_KEY = "frontier.pendingLaunch"          # "<sha> <unix time>" of the launch not yet judged
+# Seed bundles: a full install's origin refs in one file, picked up from next to the launcher
+# or the install folder so a new install only fetches what's newer than the seed
+SEED_BUNDLE_NAME = "frontier-seed.bundle"
+SEED_BUNDLE_GLOB = "frontier*.bundle"
+# LAN sharing: full installs serve their objects with `git daemon` and answer UDP pings with
+# their ref tips; updaters fetch objects from a peer first and only the refs from GitHub.
+# git daemon gets any free port (sent in the ping answer); pings go to every port of the
+# discovery range and each serving launcher takes the first free one, so several installs
+# on one PC can serve side by side
+LAN_DISCOVERY_PORT = 29418
+LAN_DISCOVERY_PORTS = 4
+LAN_DISCOVERY_TIMEOUT_SECS = 0.6
+LAN_PING = b"frontier-lan?"
+LAN_FETCH_REF = "refs/frontier/lan-fetch"  # holds peer objects until origin's fetch has run
+# Instances: extra installs that borrow the primary install's objects (git alternates) and
+# hardlink its unchanged files of these types instead of writing copies
+INSTANCES_FILE_NAME = "frontier_instances.json"   # in the primary's .git: {name: path}
+PRIMARY_INSTANCE_NAME = "primary"
+INSTANCE_PIN_REF_PREFIX = "refs/frontier/instances/"  # in the primary: keeps each instance's base commit from being pruned
+HARDLINK_SUFFIXES = ('.jar', '.zip', '.png', '.ogg', '.nbt')
+
+# 'preserve' merges these key/value files key by key; other changed files get backed up
+MERGEABLE_SUFFIXES = ('.toml', '.txt', '.properties', '.cfg', '.ini')
+
+# Launcher preferences, kept per install next to .mc_launcher_path.cache
+PREFS_FILE_NAME = ".frontier_prefs.json"
+DEFAULT_PREFS = {
+    'stage_updates': False,
+    'stage_rate_limit_kbps': 2048,
+    'lan_share': False,
+    'mirrors': '',
+    'branch_cache': False,
+    'fast_launch': False,
+}
+# (pref key, label, type) rows of the settings dialog
+SETTINGS_FIELDS = [
+    ('stage_updates', "download updates in the background while playing", bool),
+    ('stage_rate_limit_kbps', "background download cap in KB/s (0 = no cap)", int),
+    ('lan_share', "share / get updates with launchers on your network", bool),
+    ('mirrors', "extra mirror URLs (comma separated)", str),
+    ('branch_cache', "keep recent branches ready for instant switching (uses disk)", bool),
+    ('fast_launch', "launch without waiting on the update check (checks in the background)", bool),
+]
 
 # Launcher stdout/stderr log — path depends on whether we're running as a frozen exe or raw script
 if getattr(sys, 'frozen', False):
@@ -64,6 +220,14 @@ else:
 # Global Constants for Paths and Repo
 REPO_URL = "https://github.com/collebrusco/frontier.git"
 REPO_URL_SSH = "git@github.com:collebrusco/frontier.git"
+GITHUB_API_REPO_URL = "https://api.github.com/repos/collebrusco/frontier"  # blob sizes for update previews
+# Fetch mirrors, canonical first (its tip is the truth, mirrors that disagree are skipped as stale).
+# Players can add their own in settings.
+MIRROR_URLS = [REPO_URL]
+MIRROR_CACHE_NAME = "frontier_mirrors.json"  # in .git: probe results + per-mirror throughput, reused between runs
+MIRROR_PROBE_TTL_SECS = 6 * 3600
+MIRROR_PROBE_TIMEOUT_SECS = 3
+MIRROR_SCORE_BYTES = 20 * 1024 * 1024        # a typical update, to weigh throughput against latency
 
 # Application States
 STATE_UNCONNECTED = "Unconnected"
@@ -79,12 +243,25 @@ from tkinter import messagebox
 import subprocess
 import platform
 import tempfile
+import urllib.parse
 import urllib.request
 
 
 # Git download URL for Windows
 GIT_DOWNLOAD_URL = "https://github.com/git-for-windows/git/releases/download/v2.47.1.windows.2/Git-2.47.1.2-64-bit.exe"
-GIT_INSTALLER_PATH = os.path.join(os.getenv("TEMP") or tempfile.gettempdir(), "Git-Installer.exe")
+# named after the release, so a partial Git-Installer.exe left in TEMP by older launchers is never picked up
+GIT_INSTALLER_PATH = os.path.join(os.getenv("TEMP") or tempfile.gettempdir(), GIT_DOWNLOAD_URL.rsplit('/', 1)[1])
+# sha256 of the file at GIT_DOWNLOAD_URL, from the git-for-windows release notes. Update both together.
+# Empty -> the checksum git-for-windows publishes with the release (GIT_RELEASE_API_URL) is used;
+# if that can't be read either, nothing is downloaded or run.
+GIT_INSTALLER_SHA256 = ""
+GIT_RELEASE_API_URL = "https://api.github.com/repos/git-for-windows/git/releases/tags/v2.47.1.windows.2"
+
+# download_file: parallel ranged chunks, resumable between runs
+DOWNLOAD_CHUNK_BYTES = 4 * 1024 * 1024
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_RETRIES = 3                            # per chunk
+DOWNLOAD_TIMEOUT_SECS = 30
 
 # Detect OS
 OS_WIN = "Windows"
@@ -135,11 +312,148 @@ def set_git_env_var(git_path):
     return False
 
 
-def download_git_installer():
-    """Download the latest Git for Windows installer."""
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _download_stream(resp, part, total, progress):
+    received = 0
+    with open(part, 'wb') as f:
+        for block in iter(lambda: resp.read(65536), b''):
+            f.write(block)
+            received += len(block)
+            if progress:
+                progress(received, total)
+
+
+def _download_ranges(url, final_url, part, total, progress, workers, chunk_bytes):
+    """Fill `part` (preallocated to total) with ranged GETs, several at once. Finished chunks go in
+    `part`.json so the next attempt only fetches what's missing."""
+    state_path = part + '.json'
+    chunks = [(start, min(start + chunk_bytes, total) - 1) for start in range(0, total, chunk_bytes)]
+    done = set()
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+        if state['url'] == url and state['size'] == total and os.path.getsize(part) == total:
+            done = {tuple(chunk) for chunk in state['done']}
+    except (OSError, ValueError, KeyError):
+        pass
+    if not done:
+        with open(part, 'wb') as f:
+            f.truncate(total)
+    else:
+        print(f"resuming download, {len(done)}/{len(chunks)} chunks already here")
+    lock = threading.Lock()
+    received = [sum(end - start + 1 for start, end in done)]
+
+    def save_state():
+        tmp = state_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'url': url, 'size': total, 'done': sorted(done)}, f)
+        os.replace(tmp, state_path)
+
+    def fetch(chunk):
+        start, end = chunk
+        for attempt in range(DOWNLOAD_RETRIES):
+            got = 0
+            try:
+                req = urllib.request.Request(final_url, headers={'Range': f'bytes={start}-{end}'})
+                with urllib.request.urlopen(req, timeout=DOWNLOAD_TIMEOUT_SECS) as resp, open(part, 'r+b') as f:
+                    if resp.status != 206:
+                        raise IOError(f"server ignored the range request (HTTP {resp.status})")
+                    f.seek(start)
+                    for block in iter(lambda: resp.read(65536), b''):
+                        block = block[:max(0, end - start + 1 - got)]  # a server sending past the range
+                        if not block:                                   # would overwrite the next chunk
+                            break
+                        f.write(block)
+                        got += len(block)
+                        with lock:
+                            received[0] += len(block)
+                            if progress:
+                                progress(received[0], total)
+                if got != end - start + 1:
+                    raise IOError(f"got {got} of {end - start + 1} bytes")
+                with lock:
+                    done.add(chunk)
+                    save_state()
+                return
+            except Exception as e:
+                with lock:
+                    received[0] -= got
+                if attempt == DOWNLOAD_RETRIES - 1:
+                    raise
+                print(f"chunk {start}-{end} failed ({e}), retrying")
+                time.sleep(1 + attempt)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(fetch, [chunk for chunk in chunks if chunk not in done]))
+
+
+def download_file(url, dest, sha256=None, progress=None, workers=DOWNLOAD_WORKERS, chunk_bytes=DOWNLOAD_CHUNK_BYTES):
+    """Download url to dest. Servers that take Range requests get DOWNLOAD_WORKERS chunks at a time,
+    and an interrupted download picks up from the chunks already on disk (dest.part + .part.json);
+    others are streamed in one go. With sha256 the file is checked before it's moved to dest, and a
+    bad one is deleted; an existing dest is only reused if it matches (without sha256 it's downloaded
+    again). progress(done_bytes, total_bytes) is called from worker threads. Raises on failure."""
+    if sha256 and os.path.exists(dest) and _sha256_file(dest) == sha256:
+        return dest
+    part = dest + '.part'
+    req = urllib.request.Request(url, headers={'Range': 'bytes=0-0'})  # size + range support in one round trip
+    with urllib.request.urlopen(req, timeout=DOWNLOAD_TIMEOUT_SECS) as resp:
+        final_url = resp.geturl()  # after redirects (github sends release assets to a CDN)
+        content_range = resp.headers.get('Content-Range', '')
+        ranged = resp.status == 206 and '/' in content_range and not content_range.endswith('/*')
+        total = int(content_range.rsplit('/', 1)[1]) if ranged else int(resp.headers.get('Content-Length') or 0)
+        if not ranged:
+            _download_stream(resp, part, total, progress)
+    if ranged:
+        _download_ranges(url, final_url, part, total, progress, workers, chunk_bytes)
+    if sha256:
+        actual = _sha256_file(part)
+        if actual != sha256:
+            os.remove(part)
+            if os.path.exists(part + '.json'):
+                os.remove(part + '.json')
+            raise ValueError(f"checksum mismatch for {url}: expected {sha256}, got {actual}")
+    os.replace(part, dest)
+    if os.path.exists(part + '.json'):
+        os.remove(part + '.json')
+    return dest
+
+
+def git_installer_sha256():
+    """GIT_INSTALLER_SHA256, or the checksum git-for-windows publishes for the installer: the release
+    asset's digest, else the SHA-256 table in the release notes. None if neither can be read."""
+    import re
+    if GIT_INSTALLER_SHA256:
+        return GIT_INSTALLER_SHA256
+    name = GIT_DOWNLOAD_URL.rsplit('/', 1)[1]
+    try:
+        req = urllib.request.Request(GIT_RELEASE_API_URL, headers={'Accept': 'application/vnd.github+json'})
+        with urllib.request.urlopen(req, timeout=DOWNLOAD_TIMEOUT_SECS) as resp:
+            release = json.load(resp)
+    except Exception as e:
+        print(f"Couldn't read the Git release checksums: {e}")
+        return None
+    for asset in release.get('assets', []):
+        digest = asset.get('digest') or ''
+        if asset.get('name') == name and digest.startswith('sha256:'):
+            return digest.split(':', 1)[1].lower()
+    match = re.search(re.escape(name) + r'\s*\|\s*([0-9a-fA-F]{64})', release.get('body') or '')
+    return match.group(1).lower() if match else None
+
+
+def download_git_installer(sha256, progress=None):
+    """Download the Git for Windows installer and check it against sha256 (reuses a verified earlier download)."""
     try:
         print("Downloading Git installer...")
-        urllib.request.urlretrieve(GIT_DOWNLOAD_URL, GIT_INSTALLER_PATH)
+        download_file(GIT_DOWNLOAD_URL, GIT_INSTALLER_PATH, sha256, progress)
         print("Download complete.")
         return True
     except Exception as e:
@@ -147,12 +461,19 @@ def download_git_installer():
         return False
 
 
-def install_git_silently():
-    """Install Git for Windows silently."""
+def install_git_silently(progress=None):
+    """Install Git for Windows silently. Only ever runs an installer that matched the pinned or
+    published checksum (git_installer_sha256)."""
     try:
-        if not os.path.exists(GIT_INSTALLER_PATH):
-            if not download_git_installer():
-                return False
+        sha256 = git_installer_sha256()
+        if not sha256:
+            print("No checksum for the Git installer, not downloading it")
+            return False
+        if not download_git_installer(sha256, progress):
+            return False
+        if _sha256_file(GIT_INSTALLER_PATH) != sha256:  # changed on disk since it was checked
+            print("Git installer doesn't match its checksum, not running it")
+            return False
         print("Installing Git silently...")
         subprocess.run([GIT_INSTALLER_PATH, "/SILENT", "/NORESTART"], check=True)
         print("Git installation complete.")
@@ -174,11 +495,37 @@ def handle_missing_git():
             "Would you like to download and install Git automatically?"
         )
         if result:
-            if install_git_silently():
+            # small window with a bar while the installer downloads; the download runs on a thread
+            # and the bar is polled from here so tk is only touched on this thread
+            window = tk.Toplevel(root)
+            window.title("Installing Git")
+            window.resizable(False, False)
+            label = tk.Label(window, text="Downloading Git for Windows...", padx=20, pady=10)
+            label.pack()
+            bar = ttk.Progressbar(window, length=320, maximum=1.0)
+            bar.pack(padx=20, pady=(0, 20))
+            state = {'done': 0, 'total': 0, 'ok': None}
+            def _progress(done, total):
+                state['done'], state['total'] = done, total
+            def _run():
+                state['ok'] = install_git_silently(_progress)
+            worker = threading.Thread(target=_run, daemon=True)
+            worker.start()
+            while worker.is_alive():
+                if state['total']:
+                    bar['value'] = state['done'] / state['total']
+                    label.config(text=f"Downloading Git for Windows... {state['done'] // (1024 * 1024)} / {state['total'] // (1024 * 1024)} MB")
+                    if state['done'] >= state['total']:
+                        label.config(text="Installing Git...")
+                root.update()
+                time.sleep(0.05)
+            window.destroy()
+            if state['ok']:
                 messagebox.showinfo("Success", "Git was installed successfully. Please restart the application.")
                 sys.exit(0)
             else:
                 messagebox.showerror("Error", "Failed to install Git. Please install it manually.")
+                os.startfile("https://git-scm.com/download/win")
                 sys.exit(1)
     
     else:
@@ -188,7 +535,9 @@ def handle_missing_git():
             "Would you like to download and install Git manually?"
         )
         if result:
-            if get_current_os() == OS_MAC:
+            if get_current_os() == OS_WIN:
+                os.startfile("https://git-scm.com/download/win")
+            elif get_current_os() == OS_MAC:
                 subprocess.run(["open", "https://git-scm.com/download/mac"], check=True)
             elif get_current_os() == OS_LIN:
                 subprocess.run(["xdg-open", "https://git-scm.com/download/linux"], check=True)
@@ -196,14 +545,22 @@ def handle_missing_git():
 
 
 git_path = detect_git()
+GIT_FALLBACK = False  # True -> no git binary, DulwichBackend does the basics in pure python
 if not git_path:
-    handle_missing_git()
+    try:
+        import dulwich  # optional; bundled with the windows exe so a first install doesn't wait on the Git installer
+        GIT_FALLBACK = True
+        os.environ["GIT_PYTHON_REFRESH"] = "quiet"  # let GitPython import without a git binary
+        print("Git not found, using the built-in fallback (dulwich)")
+    except ImportError:
+        handle_missing_git()
 else:
     print(f"Found Git at {git_path}")
     set_git_env_var(git_path)
 
 import git  # Ensure GitPython is available after setup
-git.refresh()
+if not GIT_FALLBACK:
+    git.refresh()
 
 MINECRAFT_DEFAULT_DIR = None
 
@@ -227,16 +584,331 @@ def run_as_admin():
             return False
 
 
-def format_progress(cur, max, message):
-    return f"{cur}/{max if max else '?'} ({int((cur/max)*100) if max else '?'}%): {message.strip()}"
+def _is_shallow(repo):
+    """True if the repo was installed in quick mode (has a shallow boundary)."""
+    return os.path.exists(os.path.join(repo.git_dir, 'shallow'))
 
-def _hash_file(path):
-    h = hashlib.sha256()
+def _default_components():
+    """Optional components picked by default: shaders everywhere, the launcher exe on windows."""
+    comps = [COMPONENT_SHADERS]
+    if get_current_os() == OS_WIN:
+        comps.append(COMPONENT_LAUNCHER)
+    return comps
+
+def _sparse_patterns(components):
+    """Non-cone sparse-checkout patterns: everything, minus optional components not chosen."""
+    patterns = ['/*']
+    for comp, comp_patterns in COMPONENT_PATTERNS.items():
+        if comp not in components:
+            patterns += [f'!{pat}' for pat in comp_patterns]
+    return patterns
+
+def _excluded_by_components(path, components):
+    """True if `path` belongs to an optional component that isn't installed."""
+    for comp, comp_patterns in COMPONENT_PATTERNS.items():
+        if comp in components:
+            continue
+        for pat in comp_patterns:
+            pat = pat.lstrip('/')
+            if path == pat.rstrip('/') or (pat.endswith('/') and path.startswith(pat)):
+                return True
+    return False
+
+def _launcher_dir():
+    return Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).parent
+
+def _find_seed_bundle(install_path):
+    """Newest seed bundle next to the launcher, in the install folder or its parent, or None."""
+    found = set()
+    for d in (_launcher_dir(), Path(install_path), Path(install_path).parent):
+        if d.is_dir():
+            found.update(f.resolve() for f in d.glob(SEED_BUNDLE_GLOB) if f.is_file())
+    for bundle in sorted(found, key=lambda f: f.stat().st_mtime, reverse=True):
+        try:
+            heads = git.Git().bundle('list-heads', str(bundle))
+        except git.exc.GitCommandError:
+            continue
+        if any(line.endswith(f'refs/remotes/origin/{MAIN_BRANCH_NAME}') for line in heads.splitlines()):
+            return bundle
+    return None
+
+def _is_partial(repo):
+    """True if origin is a promisor remote, i.e. blobs are fetched on demand."""
+    with repo.config_reader() as cr:
+        return cr.has_option('remote "origin"', 'promisor')
+
+def _ls_remote_head(remote, branch, timeout, cwd=None):
+    """Tip sha of `branch` on `remote` (a URL, or a remote name of the repo at `cwd`), None if it
+    isn't there. Raises GitCommandError if git fails or takes longer than `timeout` seconds.
+    GitPython's kill_after_timeout isn't supported on Windows, so the deadline is kept here: the
+    output is read on a worker thread and git is killed if that doesn't finish in time."""
+    cmd = [git.Git.GIT_PYTHON_GIT_EXECUTABLE or 'git', 'ls-remote', '--heads', remote, f'refs/heads/{branch}']
+    flags = subprocess.CREATE_NO_WINDOW if get_current_os() == OS_WIN else 0
+    proc = subprocess.Popen(cmd, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            env={**os.environ, 'GIT_TERMINAL_PROMPT': '0'}, creationflags=flags)
+    result = {}
+    reader = threading.Thread(target=lambda: result.update(zip(('out', 'err'), proc.communicate())), daemon=True)
+    reader.start()
+    reader.join(timeout)
+    if reader.is_alive():
+        proc.kill()  # the reader is left behind; it ends once git's helpers let go of the pipes
+        raise git.exc.GitCommandError(cmd, -1, f"no answer within {timeout}s")
+    if proc.returncode != 0:
+        raise git.exc.GitCommandError(cmd, proc.returncode, result['err'])
+    for line in result['out'].decode(errors='replace').splitlines():
+        sha, _, ref = line.partition('\t')
+        if ref == f'refs/heads/{branch}':
+            return sha
+    return None
+
+def _diff_raw(repo, old, new, *paths):
+    """Tree-to-tree diff that never reads blobs. Returns [(status, path, new_oid), ...]."""
+    args = ['--raw', '-z', '--no-renames', '--no-abbrev', old, new]
+    if paths:
+        args += ['--', *paths]
+    fields = repo.git.diff(*args).split('\0')
+    changes = []
+    i = 0
+    while i + 1 < len(fields) and fields[i].startswith(':'):
+        meta = fields[i][1:].split()
+        changes.append((meta[4], fields[i + 1], meta[3]))
+        i += 2
+    return changes
+
+def _parse_mod_jar(filename):
+    """'create_ltab-3.9.0.jar' -> ('create_ltab', '3.9.0'). Dash-separated pieces with a digit in
+    them are the version, the rest name the mod (so 'ProjectRed-1.21.1-4.22.0-core' stays apart
+    from '-expansion'). Names with no dashes, like 'CreativeCore_NEOFORGE_v2.13.37', split on '_'."""
+    import re
+    stem = filename[:-4] if filename.lower().endswith('.jar') else filename
+    for sep in (r'[-+]', r'[-_+]'):
+        tokens = [t for t in re.split(sep, stem) if t]
+        name = [t for t in tokens if not any(c.isdigit() for c in t)]
+        if name:
+            return '-'.join(name), '-'.join(t for t in tokens if any(c.isdigit() for c in t))
+    return stem, ''
+
+def _tree_diff(old_files, new_files):
+    """_diff_raw's output for two {path: oid} listings, e.g. when `new` only exists on the remote."""
+    changes = [('D', p, '0' * 40) for p in old_files.keys() - new_files.keys()]
+    changes += [('A' if p not in old_files else 'M', p, oid) for p, oid in new_files.items() if old_files.get(p) != oid]
+    return sorted(changes, key=lambda c: c[1])
+
+def _mod_changelog(repo, old, new, changes=None):
+    """Tree diff old..new (no checkout, no blobs read) as {'added': [(mod, ver)], 'removed': [(mod, ver)],
+    'upgraded': [(mod, old_ver, new_ver)], 'rebuilt': [mod], 'configs': [(status, path)]}.
+    `changes` (as from _diff_raw) stands in for the diff when `new` isn't local yet."""
+    if changes is None:
+        changes = _diff_raw(repo, old, new, 'mods', 'config')
+    gone, came, rebuilt, configs = {}, {}, [], []
+    for status, path, _ in changes:
+        top, _, name = path.partition('/')
+        if top == 'config':
+            configs.append((status, path))
+        elif top == 'mods' and '/' not in name and name.lower().endswith('.jar'):
+            mod, ver = _parse_mod_jar(name)
+            if status == 'D':
+                gone[mod.lower()] = (mod, ver)
+            elif status == 'A':
+                came[mod.lower()] = (mod, ver)
+            else:
+                rebuilt.append(mod)
+    upgraded = [(came[k][0], gone[k][1], came[k][1]) for k in sorted(gone.keys() & came.keys())]
+    return {
+        'added': [came[k] for k in sorted(came.keys() - gone.keys())],
+        'removed': [gone[k] for k in sorted(gone.keys() - came.keys())],
+        'upgraded': upgraded,
+        'rebuilt': sorted(rebuilt),
+        'configs': configs,
+    }
+
+def _git_blob_hash(path):
+    """Git's blob id of a file's bytes as they are on disk (sha1 of "blob <size>\\0" + content)."""
+    h = hashlib.sha1(b"blob %d\0" % os.path.getsize(path))
     with open(path, 'rb') as f:
-        for chunk in iter(lambda: f.read(65536), b''):
+        for chunk in iter(lambda: f.read(1 << 20), b''):
             h.update(chunk)
     return h.hexdigest()
 
+def _chunks(seq, n):
+    """Split a list into n-sized pieces (keeps git command lines under the windows limit)."""
+    seq = list(seq)
+    return [seq[i:i + n] for i in range(0, len(seq), n)]
+
+def _move_file(src, dest):
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(src, dest)
+
+def _remove_empty_parents(root, path):
+    """Remove the folders above root/path that are now empty (like git does when a file goes)."""
+    parent = (Path(root) / path).parent
+    while parent != Path(root):
+        try:
+            parent.rmdir()
+        except OSError:
+            return
+        parent = parent.parent
+
+def _dir_size(path):
+    return sum(f.stat().st_size for f in Path(path).rglob('*') if f.is_file())
+
+def _format_bytes(n):
+    for unit in ('B', 'KB', 'MB'):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.2f} GB"
+
+def _format_duration(secs):
+    secs = int(secs)
+    if secs < 60:
+        return f"{secs}s"
+    if secs < 3600:
+        return f"{secs // 60}m{secs % 60:02d}s"
+    return f"{secs // 3600}h{secs % 3600 // 60:02d}m"
+
+def _record_throughput(repo, nbytes, secs):
+    """Keep a running average of download speed (bytes/s) in the repo config, for ETAs."""
+    if nbytes < THROUGHPUT_MIN_SAMPLE_BYTES or secs <= 0:
+        return
+    sample = nbytes / secs
+    with repo.config_reader() as cr:
+        prev = float(cr.get_value('frontier', 'throughput', 0))
+    with repo.config_writer() as cw:
+        cw.set_value('frontier', 'throughput', str(int(sample if not prev else 0.7 * prev + 0.3 * sample)))
+
+def _github_tree(commit_sha):
+    """{path: (blob_sha, size)} for a commit's whole tree from the GitHub API; {} if unavailable.
+    Works for commits that haven't been fetched yet."""
+    try:
+        resp = requests.get(f"{GITHUB_API_REPO_URL}/git/trees/{commit_sha}?recursive=1", timeout=5)
+        resp.raise_for_status()
+        return {e['path']: (e['sha'], e['size']) for e in resp.json().get('tree', []) if e.get('type') == 'blob'}
+    except Exception as e:
+        print(f"couldn't get the tree from github: {e}")
+        return {}
+
+def _github_blob_sizes(commit_sha):
+    """{blob_sha: size} for a commit's whole tree from the GitHub API; {} if unavailable."""
+    return dict(_github_tree(commit_sha).values())
+
+def _kv_separator(path):
+    """options.txt style files are key:value, everything else key = value."""
+    return ':' if str(path).lower().endswith('.txt') else '='
+
+def _bracket_depth(text):
+    """'[' minus ']' in a line, leaving out quoted strings (a triple-quoted one that doesn't close
+    runs to the end) and # comments, so prefix = "[" doesn't open an array."""
+    import re
+    text = re.sub(r'"""[\s\S]*?(?:"""|$)|\'\'\'[\s\S]*?(?:\'\'\'|$)|"(?:[^"\\\n]|\\.)*"|\'[^\'\n]*\'', '', text)
+    text = text.split('#', 1)[0]
+    return text.count('[') - text.count(']')
+
+def _parse_kv_blocks(text, sep):
+    """Split a key/value config into blocks: (section, key or None, raw text).
+
+    Sections are TOML headers ([a.b], repeated [[a]] get an index). A key's raw text runs
+    over continuation lines while brackets or triple quotes are open, so multi-line arrays
+    and strings stay in one block. Comments/blank lines are keyless blocks.
+    """
+    import re
+    key_re = re.compile(r'^\s*([^\s#;\[][^' + re.escape(sep) + r']*?)\s*' + re.escape(sep))
+    blocks = []
+    section = ''
+    table_counts = {}
+    lines = text.splitlines(keepends=True)
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if sep == '=' and stripped.startswith('[') and not key_re.match(line):
+            name = stripped.split('#')[0].strip()
+            if name.startswith('[['):
+                table_counts[name] = table_counts.get(name, 0) + 1
+                name = f"{name}#{table_counts[name]}"
+            section = name
+            blocks.append((section, None, line))
+            i += 1
+            continue
+        m = key_re.match(line)
+        if not m:
+            blocks.append((section, None, line))
+            i += 1
+            continue
+        raw = line
+        value = line[m.end():]
+        depth = _bracket_depth(value)
+        in_triple = value.count('"""') % 2 == 1
+        while (depth > 0 or in_triple) and i + 1 < len(lines):
+            i += 1
+            raw += lines[i]
+            rest = lines[i]
+            if in_triple:
+                if '"""' not in rest:
+                    continue
+                rest = rest.split('"""', 1)[1]  # the string closes here, brackets after it count
+                in_triple = False
+            depth += _bracket_depth(rest)
+            if rest.count('"""') % 2 == 1:
+                in_triple = True
+        blocks.append((section, m.group(1).strip(), raw))
+        i += 1
+    return blocks
+
+def _merge_kv(base, ours, theirs, sep):
+    """Three-way merge of key/value configs, per key. Starts from the new upstream file
+    (theirs) so its layout/comments win; keeps local values for keys the player changed,
+    local-only keys at the end of their section, and local deletions upstream didn't touch.
+    When both sides changed a key the player's value wins (reported as a conflict).
+    Returns (merged text, conflicting keys, local keys dropped because upstream removed them)."""
+    def values(blocks):
+        return {(sec, key): raw for sec, key, raw in blocks if key is not None}
+    base_v, ours_v = values(_parse_kv_blocks(base, sep)), values(_parse_kv_blocks(ours, sep))
+    their_blocks = _parse_kv_blocks(theirs, sep)
+    theirs_v = values(their_blocks)
+    same = lambda a, b: (a or '').strip() == (b or '').strip()
+
+    merged, conflicts = [], []
+    for sec, key, raw in their_blocks:
+        k = (sec, key)
+        if key is None or k not in ours_v and k not in base_v:
+            merged.append((sec, key, raw))          # comment, header, or new upstream key
+        elif k not in ours_v:
+            if not same(raw, base_v[k]):
+                merged.append((sec, key, raw))      # player deleted it but upstream changed it
+        elif same(ours_v[k], base_v.get(k)):
+            merged.append((sec, key, raw))          # player didn't touch it
+        else:
+            if k in base_v and not same(raw, base_v[k]) and not same(raw, ours_v[k]):
+                conflicts.append(key)
+            ours_raw = ours_v[k]
+            if raw.endswith('\n') and not ours_raw.endswith('\n'):
+                ours_raw += '\n'
+            merged.append((sec, key, ours_raw))
+
+    dropped = []
+    for (sec, key), raw in ours_v.items():
+        if (sec, key) in theirs_v:
+            continue
+        if (sec, key) in base_v:
+            if not same(raw, base_v[(sec, key)]):
+                dropped.append(key)                 # upstream removed a key the player had changed
+            continue
+        # local-only key: after the last block of its section (or a re-created section at the end)
+        if not raw.endswith('\n'):
+            raw += '\n'
+        in_sec = [i for i, (s, k, _) in enumerate(merged) if s == sec]
+        keyed = [i for i in in_sec if merged[i][1] is not None]
+        if in_sec:
+            merged.insert((keyed or in_sec[:1])[-1] + 1, (sec, key, raw))
+        else:
+            if merged and not merged[-1][2].endswith('\n'):
+                merged[-1] = merged[-1][:2] + (merged[-1][2] + '\n',)
+            if sec:
+                merged.append((sec, None, sec.split('#')[0] + '\n'))
+            merged.append((sec, key, raw))
+    return ''.join(raw for _, _, raw in merged), conflicts, dropped
+
 
 def _parse_servers_dat(path):
     """Parse servers.dat NBT and return list of {'name': ..., 'ip': ...} dicts."""
@@ -329,6 +1001,66 @@ def _get_server_info(minecraft_path):
     return None
 
 
+def _load_prefs(minecraft_path):
+    """Launcher prefs for this install, defaults filled in."""
+    prefs = dict(DEFAULT_PREFS)
+    try:
+        with open(Path(minecraft_path) / PREFS_FILE_NAME) as f:
+            prefs.update(json.load(f))
+    except Exception:
+        pass  # missing or unreadable -> defaults
+    return prefs
+
+def _save_prefs(minecraft_path, prefs):
+    with open(Path(minecraft_path) / PREFS_FILE_NAME, 'w') as f:
+        json.dump(prefs, f, indent=2)
+
+_RUN_ID = uuid.uuid4().hex  # stamped on journals, so a journal of this launcher run isn't "recovered" under its feet
+_STARTED_AT = time.time()
+
+def _read_journal(repo):
+    try:
+        return json.loads((Path(repo.git_dir) / JOURNAL_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+def _write_journal(repo, journal, **fields):
+    """Record the next step of a long operation. Written to a temp file and renamed, so a crash
+    leaves either the previous step or this one."""
+    journal.update(fields, run=_RUN_ID)
+    path = Path(repo.git_dir) / JOURNAL_NAME
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(journal))
+    os.replace(tmp, path)
+
+def _clear_journal(repo):
+    (Path(repo.git_dir) / JOURNAL_NAME).unlink(missing_ok=True)
+
+def _clear_stale_git_locks(repo, older_than=None):
+    """Lock files and half-written packs left by a git process that was killed. Only safe when
+    nothing else is using the repo (startup); with older_than, only files from before that time,
+    so live ones of background fetches and maintenance started since are left alone."""
+    git_dir = Path(repo.git_dir)
+    stale = [git_dir / name for name in ('index.lock', 'HEAD.lock', 'shallow.lock', 'packed-refs.lock', 'config.lock')]
+    stale += list((git_dir / 'refs').rglob('*.lock'))
+    stale += list((git_dir / 'objects' / 'pack').glob('tmp_*'))
+    removed = []
+    for path in stale:
+        if path.exists() and (older_than is None or path.stat().st_mtime < older_than):
+            path.unlink()
+            removed.append(path.name)
+    return removed
+
+def _mirror_urls(minecraft_path):
+    """Built-in mirrors followed by the player's own from settings."""
+    urls = list(MIRROR_URLS)
+    for url in _load_prefs(minecraft_path)['mirrors'].split(','):
+        url = url.strip()
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
 def _pick_pixel_font(root):
     """Return the first installed pixel/retro font family, or 'Courier' as fallback.
 
@@ -427,23 +1159,1408 @@ def _ping_minecraft_server(host, port=25565, timeout=5):
     return players.get('online', 0), players.get('max', 0), ping_ms, motd
 
 
+class GitProgress(git.RemoteProgress):
+    """One progress bar across the git commands of an install or update. The caller splits the
+    work into weighted steps (e.g. fetch, checkout); inside a step git's stages are weighted by
+    PROGRESS_STAGE_WEIGHTS. Bar and console updates are throttled."""
+    STAGES = {
+        git.RemoteProgress.COUNTING: 'counting',
+        git.RemoteProgress.COMPRESSING: 'compressing',
+        git.RemoteProgress.RECEIVING: 'receiving',
+        git.RemoteProgress.RESOLVING: 'resolving',
+        git.RemoteProgress.CHECKING_OUT: 'checkout',
+    }
+    LABELS = {'counting': "Counting objects", 'compressing': "Compressing objects", 'receiving': "Receiving objects",
+              'resolving': "Resolving deltas", 'checkout': "Updating files"}
+
+    def __init__(self, print_cb, bar_cb, steps):
+        super().__init__()
+        self.print_cb = print_cb
+        self.bar_cb = bar_cb
+        self.steps = steps                  # [(name, weight)], weights summing to 1
+        self.step_index = 0
+        self.stage_index = 0
+        self.stage_frac = 0.0
+        self.started = time.monotonic()
+        self.last_bar = self.last_print = 0.0
+        self.rate = ''
+
+    def start(self, step):
+        self.step_index = [name for name, _ in self.steps].index(step)
+        self.stage_index, self.stage_frac = 0, 0.0
+        self.error_lines, self.other_lines = [], []
+
+    def fraction(self):
+        done = sum(weight for _, weight in self.steps[:self.step_index])
+        order = [name for name, _ in PROGRESS_STAGE_WEIGHTS]
+        weights = [weight for _, weight in PROGRESS_STAGE_WEIGHTS]
+        in_step = sum(weights[:self.stage_index]) + weights[self.stage_index] * self.stage_frac
+        return min(done + self.steps[self.step_index][1] * in_step / sum(weights), 1.0)
+
+    def line_dropped(self, line):
+        # `git checkout/merge --progress` reports "Updating files: 45% (900/2000)", which
+        # RemoteProgress doesn't know about
+        match = self.re_op_relative.match(line)
+        if match and match.group(2) == "Updating files":
+            done = line.rstrip().endswith(self.DONE_TOKEN)
+            self.update(self.CHECKING_OUT | (self.END if done else 0), float(match.group(4)), float(match.group(5)), '')
+
+    def update(self, op_code, cur_count, max_count=None, message=''):
+        stage = self.STAGES.get(op_code & self.OP_MASK)
+        if stage is None:
+            return
+        index = [name for name, _ in PROGRESS_STAGE_WEIGHTS].index(stage)
+        if index < self.stage_index:
+            return  # e.g. a lazy blob fetch inside checkout; keep the bar moving forward only
+        self.stage_index = index
+        self.stage_frac = 1.0 if op_code & self.END else (cur_count / max_count if max_count else 0.0)
+        if '|' in message:
+            self.rate = message.split('|')[-1].strip()  # git's own "4.50 MiB/s"
+        now = time.monotonic()
+        if now - self.last_bar >= PROGRESS_BAR_SECS or op_code & self.END:
+            self.last_bar = now
+            self.bar_cb(self.fraction(), 1)
+        if now - self.last_print >= PROGRESS_PRINT_SECS or op_code & self.END:
+            self.last_print = now
+            self.print_cb(self.describe(stage, cur_count, max_count), "cyan")
+
+    def describe(self, stage, cur_count, max_count):
+        frac = self.fraction()
+        count = f"{int(cur_count or 0)}/{int(max_count)}" if max_count else f"{int(cur_count or 0)}"
+        line = f"{self.LABELS[stage]} {count}"
+        if stage == 'receiving' and self.rate:
+            line += f" at {self.rate}"
+        line += f" | {int(frac * 100)}%"
+        elapsed = time.monotonic() - self.started
+        if 0.02 < frac < 1 and elapsed > 2:
+            eta = int(elapsed * (1 - frac) / frac)
+            line += f", about {eta // 60}:{eta % 60:02d} left"
+        return line
+
+    def done(self):
+        self.bar_cb(1, 1)
+
+
+class _ProgressWriter:
+    """File-like sink for dulwich's progress output that feeds git-style lines to a GitProgress."""
+    def __init__(self, progress):
+        self.handler = progress.new_message_handler()
+        self.buf = b''
+
+    def write(self, data):
+        import re
+        *lines, self.buf = re.split(rb'[\r\n]', self.buf + data)
+        for line in lines:
+            if line:
+                self.handler(line.decode('utf-8', errors='replace'))
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+class OperationCancelled(UserWarning):
+    """A download was stopped with the cancel button."""
+
+
+class RemoteState:
+    """Coalesced, TTL-cached view of origin's refs, one entry per install path.
+
+    Concurrent refreshes of the same path share a single fetch; refreshes within `ttl`
+    seconds of the last fetch reuse its refs. Every fetch made through GitBackend.fetch_origin
+    lands here, so a fetch done by an update also counts.
+    """
+    def __init__(self, backend, ttl=REMOTE_CACHE_TTL_SECS):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._inflight = {}     # path -> Event set when the running fetch finishes
+        self._errors = {}       # path -> exception from the last shared fetch
+        self._fetched_at = {}   # path -> time of last successful fetch
+        self._refs = {}         # path -> {branch: sha}
+
+    @staticmethod
+    def _key(path):
+        return str(Path(path).resolve())
+
+    def record(self, repo):
+        """Snapshot origin's refs after a successful fetch."""
+        key = self._key(repo.working_tree_dir)
+        refs = {ref.remote_head: ref.commit.hexsha for ref in repo.remotes.origin.refs}
+        with self._lock:
+            self._refs[key] = refs
+            self._fetched_at[key] = time.time()
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._fetched_at.clear()
+            else:
+                self._fetched_at.pop(self._key(path), None)
+
+    def refresh(self, path, force=False):
+        """Make sure the cached refs for `path` are fresh, fetching at most once across callers."""
+        key = self._key(path)
+        with self._lock:
+            fetched_at = self._fetched_at.get(key)
+            if not force and fetched_at is not None and time.time() - fetched_at < self.ttl:
+                return self._refs[key]
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = self._inflight[key] = threading.Event()
+        if not owner:
+            event.wait()
+            with self._lock:
+                if key in self._errors:
+                    raise self._errors[key]
+                return self._refs[key]
+        try:
+            self.backend.fetch_origin(git.Repo(path))  # records the refs
+            with self._lock:
+                self._errors.pop(key, None)
+                return self._refs[key]
+        except Exception as e:
+            with self._lock:
+                self._errors[key] = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+    def branches(self, path):
+        return list(self.refresh(path))
+
+    def remote_head(self, path, branch):
+        return self.refresh(path).get(branch)
+
+    def ahead_behind(self, repo, branch):
+        """(commits only local, commits only on origin) for `branch`, from the cached refs."""
+        remote_sha = self.remote_head(repo.working_tree_dir, branch)
+        if remote_sha is None:
+            return None
+        ahead, behind = repo.git.rev_list('--left-right', '--count', f'HEAD...{remote_sha}').split()
+        return int(ahead), int(behind)
+
+
+class PostUpdateHooks:
+    """Hooks that run after HEAD moves, picked by the paths that changed between the old and
+    new commit. The changed paths come from a tree diff, so unchanged files cost nothing."""
+    def __init__(self, ui_callback):
+        self.ui_callback = ui_callback
+        self._hooks = []  # (name, patterns, fn)
+
+    def register(self, name, patterns, fn):
+        """fn(repo, old, new, changes) is called with the (status, path, oid) entries matching any of `patterns`."""
+        self._hooks.append((name, patterns, fn))
+
+    def run(self, repo, old, new):
+        if old == new:
+            return
+        changes = _diff_raw(repo, old, new)
+        for name, patterns, fn in self._hooks:
+            hits = [c for c in changes if any(fnmatch.fnmatchcase(c[1], pat) for pat in patterns)]
+            if not hits:
+                continue
+            try:
+                fn(repo, old, new, hits)
+            except Exception as e:
+                print(f"post-update hook '{name}' failed: {e}")
+                self.ui_callback(f"post-update step '{name}' failed: {e}", "orange")
+
+
+class MirrorSelector:
+    """Picks the mirror origin fetches from. Candidates' ref advertisements are timed with ls-remote
+    (in parallel); a mirror whose tip differs from the canonical one is stale and skipped. Probe
+    results and per-mirror fetch throughput are kept in .git, so later runs reuse them until
+    MIRROR_PROBE_TTL_SECS passes. With a single candidate nothing is probed."""
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def _load(self, repo):
+        try:
+            return json.loads((Path(repo.git_dir) / MIRROR_CACHE_NAME).read_text())
+        except Exception:
+            return {'probed_at': 0, 'mirrors': {}}
+
+    def _save(self, repo, cache):
+        (Path(repo.git_dir) / MIRROR_CACHE_NAME).write_text(json.dumps(cache, indent=2))
+
+    def candidates(self, repo):
+        urls = _mirror_urls(repo.working_tree_dir)
+        if repo.remotes.origin.url == REPO_URL_SSH:
+            urls[urls.index(REPO_URL)] = REPO_URL_SSH  # keep ssh installs on ssh
+        return urls
+
+    def known_urls(self, path):
+        """Every origin URL an install of ours may have (for check_repo)."""
+        urls = [REPO_URL, REPO_URL_SSH] + _mirror_urls(path)
+        try:
+            urls += list(self._load(git.Repo(path))['mirrors'])  # mirrors used before, even if since removed
+        except Exception:
+            pass
+        return urls
+
+    @staticmethod
+    def _probe(url, branch):
+        t0 = time.time()
+        try:
+            tip = _ls_remote_head(url, branch, MIRROR_PROBE_TIMEOUT_SECS)
+        except git.exc.GitCommandError:
+            return None
+        return {'latency': time.time() - t0, 'tip': tip}
+
+    def ranked(self, repo, branch=MAIN_BRANCH_NAME, force=False):
+        """Candidate URLs to try in order: healthy ones fastest first, then unreachable ones. Stale ones
+        (tip of `branch` differs from the canonical URL's) are left out."""
+        urls = self.candidates(repo)
+        if len(urls) == 1:
+            return urls
+        with self._lock:
+            cache = self._load(repo)
+            mirrors = cache.setdefault('mirrors', {})
+            if (force or time.time() - cache.get('probed_at', 0) > MIRROR_PROBE_TTL_SECS or cache.get('branch') != branch
+                    or any(u not in mirrors for u in urls)):
+                with ThreadPoolExecutor(len(urls)) as pool:
+                    results = dict(zip(urls, pool.map(lambda u: self._probe(u, branch), urls)))
+                canonical_tip = (results[urls[0]] or {}).get('tip')
+                for url, res in results.items():
+                    entry = mirrors.setdefault(url, {})
+                    entry['ok'] = res is not None
+                    entry['stale'] = res is not None and canonical_tip is not None and res['tip'] != canonical_tip
+                    entry['latency'] = res['latency'] if res else None
+                    state = 'down' if res is None else f"{res['latency']:.2f}s" + (' (stale)' if entry['stale'] else '')
+                    print(f"mirror {url}: {state}")
+                cache['probed_at'] = time.time()
+                cache['branch'] = branch
+                self._save(repo, cache)
+
+        def score(url):
+            entry = mirrors[url]
+            s = entry.get('latency') or MIRROR_PROBE_TIMEOUT_SECS
+            if entry.get('throughput'):
+                s += MIRROR_SCORE_BYTES / entry['throughput']
+            return s
+        healthy = sorted((u for u in urls if mirrors[u].get('ok') and not mirrors[u].get('stale')), key=score)
+        return healthy + [u for u in urls if not mirrors[u].get('ok')]
+
+    def invalidate(self, repo):
+        """Re-probe on the next fetch (throughput history is kept)."""
+        with self._lock:
+            cache = self._load(repo)
+            if cache.get('probed_at'):
+                cache['probed_at'] = 0
+                self._save(repo, cache)
+
+    def record_fetch(self, repo, url, nbytes, secs):
+        if nbytes < THROUGHPUT_MIN_SAMPLE_BYTES or secs <= 0:
+            return
+        with self._lock:
+            cache = self._load(repo)
+            entry = cache.setdefault('mirrors', {}).setdefault(url, {})
+            prev = entry.get('throughput')
+            entry['throughput'] = nbytes / secs if not prev else 0.7 * prev + 0.3 * nbytes / secs
+            self._save(repo, cache)
+
+    def mark_failed(self, repo, url):
+        with self._lock:
+            cache = self._load(repo)
+            cache.setdefault('mirrors', {}).setdefault(url, {})['ok'] = False
+            self._save(repo, cache)
+
+
+class LanPeers:
+    """Opt-in LAN sharing. serve() exports a full install read-only with `git daemon` and answers
+    discovery pings with its ref tips; discover() lists the launchers that answered."""
+    def __init__(self):
+        self.instance_id = uuid.uuid4().hex  # so a launcher doesn't fetch from itself
+        self._lock = threading.Lock()
+        self._daemon = None
+        self._sock = None
+        self._repo_path = None
+
+    def serving(self):
+        return self._daemon is not None and self._daemon.poll() is None
+
+    def serve(self, repo_path):
+        repo_path = Path(repo_path).resolve()
+        with self._lock:
+            if self.serving() and self._repo_path == repo_path:
+                return
+        self.stop()
+        sock = self._bind_discovery()
+        with socket.socket() as probe:
+            probe.bind(('', 0))
+            git_port = probe.getsockname()[1]
+        flags = subprocess.CREATE_NO_WINDOW if get_current_os() == OS_WIN else 0
+        daemon = subprocess.Popen(
+            [git.Git.GIT_PYTHON_GIT_EXECUTABLE or 'git', 'daemon', '--reuseaddr', f'--port={git_port}',
+             '--export-all', f'--base-path={repo_path}', str(repo_path)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=flags)
+        with self._lock:
+            self._daemon, self._sock, self._repo_path = daemon, sock, repo_path
+        threading.Thread(target=self._answer_pings, args=(sock, repo_path, git_port), daemon=True).start()
+        print(f"LAN: serving {repo_path} on port {git_port} (discovery on {sock.getsockname()[1]})")
+
+    @staticmethod
+    def _bind_discovery():
+        """UDP socket on the first free port of the discovery range. No SO_REUSEADDR: a port another
+        launcher on this PC has is skipped, instead of sharing it and only one of them getting pings."""
+        for port in range(LAN_DISCOVERY_PORT, LAN_DISCOVERY_PORT + LAN_DISCOVERY_PORTS):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                sock.bind(('', port))
+            except OSError:
+                sock.close()
+                continue
+            sock.settimeout(1.0)
+            return sock
+        raise OSError(f"LAN discovery ports {LAN_DISCOVERY_PORT}-{LAN_DISCOVERY_PORT + LAN_DISCOVERY_PORTS - 1} are all taken")
+
+    def _answer_pings(self, sock, repo_path, git_port):
+        while self._sock is sock:
+            try:
+                data, addr = sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                return  # closed by stop()
+            if data != LAN_PING:
+                continue
+            try:
+                out = git.Repo(repo_path).git.for_each_ref('--format=%(refname) %(objectname)', 'refs/heads', 'refs/remotes/origin')
+                refs = dict(line.split() for line in out.splitlines())
+                sock.sendto(json.dumps({'id': self.instance_id, 'port': git_port, 'refs': refs}).encode(), addr)
+            except Exception as e:
+                print(f"LAN: couldn't answer {addr}: {e}")
+
+    def stop(self):
+        with self._lock:
+            daemon, sock = self._daemon, self._sock
+            self._daemon = self._sock = self._repo_path = None
+        if sock is not None:
+            sock.close()
+        if daemon is not None and daemon.poll() is None:
+            daemon.terminate()
+            try:
+                daemon.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                daemon.kill()
+
+    def discover(self, timeout=LAN_DISCOVERY_TIMEOUT_SECS):
+        """[(ip, port, {refname: sha})] of the launchers that answered within `timeout`."""
+        peers = {}
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            for addr in ('<broadcast>', '127.0.0.1'):  # loopback covers a second install on this PC
+                for port in range(LAN_DISCOVERY_PORT, LAN_DISCOVERY_PORT + LAN_DISCOVERY_PORTS):
+                    try:
+                        sock.sendto(LAN_PING, (addr, port))
+                    except OSError:
+                        pass
+            deadline = time.time() + timeout
+            while (left := deadline - time.time()) > 0:
+                sock.settimeout(left)
+                try:
+                    data, (ip, _) = sock.recvfrom(65536)
+                    info = json.loads(data)
+                except socket.timeout:
+                    break
+                except (OSError, ValueError):
+                    continue
+                if isinstance(info, dict) and info.get('id') != self.instance_id and 'port' in info:
+                    peers.setdefault(info['id'], (ip, info['port'], info.get('refs', {})))  # first answer per launcher
+        return list(peers.values())
+
+
+class ScheduledTask:
+    """One queued action. `progress` (0..1, None if it doesn't report any) follows the progress
+    bar while it runs; `cancelled` is set by TaskScheduler.cancel()."""
+    def __init__(self, seq, target, args, kind, priority, name):
+        self.seq = seq
+        self.target = target
+        self.args = args
+        self.kind = kind
+        self.priority = priority
+        self.name = name
+        self.progress = None
+        self.cancelled = threading.Event()
+
+    def same_as(self, other):
+        return self.target == other.target and self.args == other.args
+
+    def describe(self):
+        return f"'{self.name}'" + (f" ({int(self.progress * 100)}%)" if self.progress is not None else "")
+
+
+class TaskScheduler:
+    """Priority queue of button actions with a read/write lock on the repo.
+
+    Tasks start in (priority, submit order). Reads share the repo with other reads, a write has
+    it to itself, free tasks never wait. Once a read or write has to wait, the ones behind it
+    wait too, so a queued update isn't starved by a stream of status checks. Each task runs on
+    its own thread; the same action submitted twice while the first is queued or running is dropped.
+    """
+    def __init__(self, notify=None):
+        self.notify = notify or (lambda msg, color: None)
+        self._lock = threading.Lock()
+        self._pending = []      # [ScheduledTask], sorted by (priority, seq)
+        self._running = set()
+        self._readers = 0
+        self._writer = None     # running write task
+        self._held = False      # write slot taken outside of a task (maintenance)
+        self._seq = 0
+        self._local = threading.local()
+
+    @staticmethod
+    def _task_name(target):
+        name = getattr(target, '__name__', 'task').strip('_')
+        for affix in ('control_', '_internal', '_task'):
+            name = name.replace(affix, '')
+        return name.replace('_', ' ')
+
+    def submit(self, target, *args, kind=TASK_WRITE, priority=TASK_PRIORITY_NORMAL, name=None):
+        """Queue target(*args). Returns the ScheduledTask, or None if the same one is already queued or running."""
+        with self._lock:
+            self._seq += 1
+            task = ScheduledTask(self._seq, target, args, kind, priority, name or self._task_name(target))
+            if any(task.same_as(other) for other in [*self._running, *self._pending]):
+                self.notify(f"'{task.name}' is already queued or running", "white")
+                return None
+            self._pending.append(task)
+            self._pending.sort(key=lambda t: (t.priority, t.seq))
+            started = self._dispatch()
+            ahead = [t.describe() for t in self._running if t.kind != TASK_FREE]
+        for t in started:
+            self._start(t)
+        if task not in started:
+            self.notify(f"'{task.name}' queued, waiting for {', '.join(ahead) or 'maintenance'}", "white")
+        return task
+
+    def _dispatch(self):
+        """Move every task that may run now from pending to running (lock held). Returns them."""
+        started, waiting, blocked = [], [], False
+        for task in self._pending:
+            if task.kind == TASK_FREE:
+                ok = True
+            elif blocked or self._writer is not None or self._held:
+                ok = False
+            else:
+                ok = task.kind == TASK_READ or self._readers == 0
+            if not ok:
+                waiting.append(task)
+                blocked = blocked or task.kind != TASK_FREE
+                continue
+            if task.kind == TASK_READ:
+                self._readers += 1
+            elif task.kind == TASK_WRITE:
+                self._writer = task
+            self._running.add(task)
+            started.append(task)
+        self._pending = waiting
+        return started
+
+    def _start(self, task):
+        threading.Thread(target=self._run, args=(task,), daemon=False).start()
+
+    def _run(self, task):
+        self._local.task = task
+        try:
+            if not task.cancelled.is_set():
+                task.target(*task.args)
+        finally:
+            self._local.task = None
+            with self._lock:
+                self._running.discard(task)
+                if task.kind == TASK_READ:
+                    self._readers -= 1
+                elif task is self._writer:
+                    self._writer = None
+                started = self._dispatch()
+            for t in started:
+                self._start(t)
+
+    def current(self):
+        """The task running on this thread, if any."""
+        return getattr(self._local, 'task', None)
+
+    def adopt(self, task):
+        """Count this helper thread's work (e.g. a git output reader) towards `task`, the task that started it."""
+        self._local.task = task
+
+    def set_progress(self, fraction):
+        task = self.current()
+        if task is not None:
+            task.progress = fraction
+
+    def waiting(self):
+        """True if a read or write is queued."""
+        with self._lock:
+            return any(task.kind != TASK_FREE for task in self._pending)
+
+    def try_hold(self):
+        """Take the write slot without a task, only if nothing is running or queued for the repo."""
+        with self._lock:
+            if self._held or self._writer is not None or self._readers or any(t.kind != TASK_FREE for t in self._pending):
+                return False
+            self._held = True
+            return True
+
+    def release_hold(self):
+        with self._lock:
+            self._held = False
+            started = self._dispatch()
+        for t in started:
+            self._start(t)
+
+    def cancel(self):
+        """Drop every queued task and flag the running ones. Returns (dropped, running) tasks."""
+        with self._lock:
+            dropped, self._pending = self._pending, []
+            running = list(self._running)
+        for task in dropped + running:
+            task.cancelled.set()
+        return dropped, running
+
+
 class GitBackend:
     def __init__(self, ui_callback, ui_bar_callback, quit_cb):
         self.ui_callback = ui_callback
-        self.ui_bar_callback = ui_bar_callback
+        self.ui_bar_callback = lambda current, maximum: (self.tasks.set_progress(current / maximum if maximum else None),
+                                                         ui_bar_callback(current, maximum))
         self.quit_cb = quit_cb
-        self.semaphore = threading.Semaphore(1)
+        self.tasks = TaskScheduler(ui_callback)
+        self._git_ops = set()               # running cancellable git processes
+        self._git_ops_cancelled = set()
+        self._git_ops_lock = threading.Lock()
+        self.remote = RemoteState(self)
+        self.hooks = PostUpdateHooks(ui_callback)
+        self.lan = LanPeers()
+        self.mirrors = MirrorSelector()
+        self.hooks.register('launcher restart', [LAUNCHER_EXE_NAME], self._hook_launcher_restart)
+        # the config migration this pack needs: a renamed resource/shader pack zip would otherwise
+        # silently drop out of the player's selection in options.txt / the shader config
+        self.hooks.register('pack selection migration', ['resourcepacks/*', 'shaderpacks/*'], self._hook_migrate_pack_selection)
+        self.hooks.register('cache invalidation', ['*'], self._hook_invalidate_caches)
+        self.hooks.register('dynamic pack reset', ['mods/*'], self._hook_reset_dynamic_packs)
+
+    def _hook_launcher_restart(self, repo, old, new, changes):
+        exe_path = Path(repo.working_tree_dir) / LAUNCHER_EXE_NAME
+        if get_current_os() != OS_WIN or not exe_path.exists():
+            return
+        self.ui_callback("Launcher executable was updated!", "yellow")
+        if messagebox.askyesno("Launcher Updated", "The Frontier Launcher itself was updated.\nRestart now to run the new version?"):
+            env = os.environ.copy()
+            for key in ('TCL_LIBRARY', 'TK_LIBRARY', 'TCLLIBPATH', 'TCL_ZIPFS_ROOT', 'TK_ZIPFS_ROOT'):
+                env.pop(key, None)
+            subprocess.Popen([str(exe_path)], env=env)
+            self.quit_cb()
+
+    def _hook_migrate_pack_selection(self, repo, old, new, changes):
+        """A resource pack or shader pack the player had selected was replaced by a new file in the
+        same folder (e.g. a version bump renamed the zip): point options.txt / the shader config at it."""
+        root = Path(repo.working_tree_dir)
+        swaps = {}
+        for folder in ('resourcepacks', 'shaderpacks'):
+            removed = [p for st, p, _ in changes if st == 'D' and p.startswith(folder + '/') and p.count('/') == 1]
+            added = [p for st, p, _ in changes if st == 'A' and p.startswith(folder + '/') and p.count('/') == 1]
+            if len(removed) == 1 and len(added) == 1:
+                swaps[folder] = (removed[0].split('/', 1)[1], added[0].split('/', 1)[1])
+        if 'resourcepacks' in swaps:
+            old_name, new_name = swaps['resourcepacks']
+            options = root / 'options.txt'
+            if options.exists():
+                text = options.read_text(encoding='utf-8', errors='surrogateescape')
+                new_text = text.replace(json.dumps(f"file/{old_name}"), json.dumps(f"file/{new_name}"))
+                if new_text != text:
+                    options.write_text(new_text, encoding='utf-8', errors='surrogateescape')
+                    self.ui_callback(f"switched your resource pack {old_name} -> {new_name}", "cyan")
+        if 'shaderpacks' in swaps:
+            old_name, new_name = swaps['shaderpacks']
+            for conf in ('iris.properties', 'oculus.properties'):
+                conf_path = root / 'config' / conf
+                if not conf_path.exists():
+                    continue
+                lines = conf_path.read_text(encoding='utf-8', errors='surrogateescape').splitlines(keepends=True)
+                changed = False
+                for i, line in enumerate(lines):
+                    key, sep, value = line.partition('=')
+                    if sep and key.strip() == 'shaderPack' and value.strip() == old_name:
+                        lines[i] = f"{key}={new_name}\n"
+                        changed = True
+                if changed:
+                    conf_path.write_text(''.join(lines), encoding='utf-8', errors='surrogateescape')
+                    self.ui_callback(f"switched your shader pack {old_name} -> {new_name}", "cyan")
+
+    def _hook_invalidate_caches(self, repo, old, new, changes):
+        """Drop derived state the new commit makes stale: verify-cache entries of the changed paths
+        and the mirror probe results, whose staleness verdicts were made against the old tip."""
+        cache_path = Path(repo.git_dir) / VERIFY_CACHE_NAME
+        try:
+            cache = json.loads(cache_path.read_text())
+        except Exception:
+            cache = None
+        if cache:
+            for _status, path, _oid in changes:
+                cache.pop(path, None)
+            cache_path.write_text(json.dumps(cache))
+        self.mirrors.invalidate(repo)
+
+    def _hook_reset_dynamic_packs(self, repo, old, new, changes):
+        """Mods changed: drop untracked files in the runtime-generated pack caches so the mods
+        regenerate them instead of loading leftovers from the old versions."""
+        root = Path(repo.working_tree_dir)
+        dirs = [d for d in DYNAMIC_PACK_DIRS if (root / d).exists()]
+        if dirs:
+            repo.git.clean('-fdq', '--', *dirs)
+
+    def fetch_origin(self, repo, progress=None, branch=None):
+        """Fetch origin from the best mirror, failing over to the next one if a fetch fails.
+        Mirrors are checked for staleness on `branch` (default: the checked out one).
+        Shallow (quick) installs are kept at SHALLOW_DEPTH so history never piles up."""
+        origin = repo.remotes.origin
+        pack_dir = Path(repo.git_dir) / 'objects' / 'pack'
+        last_err = None
+        if branch is None:
+            branch = MAIN_BRANCH_NAME if repo.head.is_detached else repo.active_branch.name
+        for url in self.mirrors.ranked(repo, branch):
+            if origin.url != url:
+                print(f"origin -> {url}")
+                origin.set_url(url)
+            size0, t0 = _dir_size(pack_dir), time.time()
+            try:
+                if _is_shallow(repo):
+                    self.run_git_op(repo, 'fetch', '--progress', f'--depth={SHALLOW_DEPTH}', 'origin', progress=progress)
+                else:
+                    self.run_git_op(repo, 'fetch', '--progress', 'origin', progress=progress)
+            except git.exc.GitCommandError as e:
+                print(f"fetch from {url} failed: {e}")
+                self.mirrors.mark_failed(repo, url)
+                last_err = e
+                continue
+            nbytes, secs = _dir_size(pack_dir) - size0, time.time() - t0
+            _record_throughput(repo, nbytes, secs)
+            self.mirrors.record_fetch(repo, url, nbytes, secs)
+            self.remote.record(repo)
+            return
+        raise last_err
+
+    def run_git_op(self, repo, *args, progress=None, cancellable=True):
+        """Run a network git command (fetch) that the cancel button can stop and that gets killed
+        if it prints nothing for GIT_STALL_TIMEOUT_SECS. progress is a GitPython-style callback or
+        a GitProgress. With cancellable=False (local checkouts) it only streams the progress."""
+        import re
+        rp = git.remote.to_progress_instance(progress)
+        rp.error_lines, rp.other_lines = [], []
+        handler = rp.new_message_handler()
+        handle = repo.git.execute([repo.git.GIT_PYTHON_GIT_EXECUTABLE, *args], as_process=True)
+        proc = handle.proc  # keep handle referenced: GitPython kills the process when it's collected
+        if cancellable:
+            with self._git_ops_lock:
+                self._git_ops.add(proc)
+        last_output = [time.monotonic()]
+        owner = self.tasks.current()
+
+        def pump():
+            self.tasks.adopt(owner)  # progress callbacks run here, the task's bar should still move
+            # git redraws progress with \r, so split on both to see every update
+            buf = b''
+            for chunk in iter(lambda: proc.stderr.read1(65536), b''):
+                last_output[0] = time.monotonic()
+                *lines, buf = re.split(rb'[\r\n]', buf + chunk)
+                for line in lines:
+                    if line:
+                        handler(line.decode('utf-8', errors='replace'))
+            if buf:
+                handler(buf.decode('utf-8', errors='replace'))
+
+        reader = threading.Thread(target=pump, daemon=True)
+        reader.start()
+        stalled = False
+        while reader.is_alive() and proc.poll() is None:
+            reader.join(0.25)
+            if cancellable and not stalled and time.monotonic() - last_output[0] > GIT_STALL_TIMEOUT_SECS:
+                stalled = True
+                proc.kill()
+        status = proc.wait()
+        reader.join(2)  # a helper git started (remote-https) can hold stderr open after git is killed
+        with self._git_ops_lock:
+            self._git_ops.discard(proc)
+            cancelled = proc in self._git_ops_cancelled
+            self._git_ops_cancelled.discard(proc)
+        if cancelled:
+            raise OperationCancelled(f"git {args[0]} cancelled")
+        if stalled:
+            raise git.exc.GitCommandError(list(args), status, f"no progress for {GIT_STALL_TIMEOUT_SECS}s, gave up")
+        if status:
+            raise git.exc.GitCommandError(list(args), status, '\n'.join(rp.error_lines + rp.other_lines[-10:]))
+
+    def cancel_git_ops(self):
+        """Stop every running download. Returns how many were stopped."""
+        with self._git_ops_lock:
+            procs = list(self._git_ops)
+            self._git_ops_cancelled.update(procs)
+        for proc in procs:
+            proc.kill()
+        return len(procs)
+
+    def preview_update(self, repo, branch, target=None):
+        """Compare HEAD with origin/<branch>, or with `target` (a sha from ls-remote), without
+        checking anything out.
+
+        Returns {'base', 'target', 'changes' (as _diff_raw), 'dirs': {top_dir: {'A'|'M'|'D': count}},
+        'write_bytes', 'download_bytes', 'unknown' (blobs of unknown size), 'eta_secs'} or None if
+        up to date. Blobs already local cost nothing to download; sizes of missing ones come from
+        the GitHub tree API. A target that hasn't been fetched yet is diffed against GitHub's tree
+        listing, so the size is known before anything is downloaded; LookupError if that's unavailable.
+        """
+        base = repo.head.commit.hexsha
+        if target is None:
+            target = repo.remotes.origin.refs[branch].commit.hexsha
+        if base == target:
+            return None
+        try:
+            repo.git.cat_file('-e', f'{target}^{{commit}}')
+            remote_tree = None
+        except git.exc.GitCommandError:
+            remote_tree = _github_tree(target)
+            if not remote_tree:
+                raise LookupError(f"no tree listing for {target[:7]}")
+        if remote_tree is None:
+            changes = _diff_raw(repo, base, target)
+        else:
+            base_files = {}
+            for entry in repo.git.ls_tree('-r', '-z', base).split('\0'):
+                meta, _, p = entry.partition('\t')
+                if p and meta.split()[1] == 'blob':
+                    base_files[p] = meta.split()[2]
+            changes = _tree_diff(base_files, {p: oid for p, (oid, _size) in remote_tree.items()})
+        components = self.get_components(repo)
+        changes = [c for c in changes if not _excluded_by_components(c[1], components)]
+
+        dirs = {}
+        for status, path, _ in changes:
+            top = path.split('/')[0] + '/' if '/' in path else path
+            dirs.setdefault(top, {'A': 0, 'M': 0, 'D': 0})
+            dirs[top][status if status in ('A', 'D') else 'M'] += 1
+
+        wanted = {oid for status, _, oid in changes if status != 'D'}
+        if remote_tree is not None:
+            sizes = dict(remote_tree.values())
+            missing = set()
+            for oid in wanted:
+                try:
+                    repo.odb.info(bytes.fromhex(oid))
+                except Exception:
+                    missing.add(oid)
+        else:
+            missing = set()
+            if _is_partial(repo):
+                listing = repo.git.rev_list('--objects', '--missing=print', '--no-object-names', target)
+                missing = {line[1:] for line in listing.splitlines() if line.startswith('?')} & wanted
+            sizes = {oid: repo.odb.info(bytes.fromhex(oid)).size for oid in wanted - missing}
+            if missing:
+                remote_sizes = _github_blob_sizes(target)
+                sizes.update({oid: remote_sizes[oid] for oid in missing if oid in remote_sizes})
+
+        download_bytes = sum(sizes.get(oid, 0) for oid in missing)
+        with repo.config_reader() as cr:
+            throughput = float(cr.get_value('frontier', 'throughput', 0))
+        return {
+            'base': base,
+            'target': target,
+            'changes': changes,
+            'dirs': dirs,
+            'write_bytes': sum(sizes.get(oid, 0) for oid in wanted),
+            'download_bytes': download_bytes,
+            'unknown': len(wanted - sizes.keys()),
+            'eta_secs': download_bytes / throughput if throughput else None,
+        }
+
+    def print_mod_changelog(self, repo, old, new, limit=12, changes=None):
+        log = _mod_changelog(repo, old, new, changes)
+        lines = [(f"+ {mod} {ver}", "lime") for mod, ver in log['added']]
+        lines += [(f"- {mod} {ver}", "red") for mod, ver in log['removed']]
+        lines += [(f"^ {mod} {old_ver} -> {new_ver}", "cyan") for mod, old_ver, new_ver in log['upgraded']]
+        lines += [(f"~ {mod} (same version, new file)", "white") for mod in log['rebuilt']]
+        lines += [(f"{status} {path}", "white") for status, path in log['configs']]
+        if not lines:
+            return
+        self.ui_callback(f"what's new in {new[:7]}: {len(log['added'])} added, {len(log['removed'])} removed, "
+                         f"{len(log['upgraded'])} upgraded mods, {len(log['configs'])} config file(s)", "yellow")
+        for line, color in lines[:limit]:
+            self.ui_callback(f"  {line}", color)
+        if len(lines) > limit:
+            self.ui_callback(f"  ...and {len(lines) - limit} more", "white")
+
+    def confirm_update_preview(self, repo, branch, target=None):
+        """Print the update preview; ask before big downloads. Returns False if the player postpones.
+        With `target` (not fetched yet) this runs before the download; LookupError if it can't be sized."""
+        preview = self.preview_update(repo, branch, target)
+        if preview is None:
+            return True
+        lines = [f"update {preview['base'][:7]} -> {preview['target'][:7]}:"]
+        for top, counts in sorted(preview['dirs'].items()):
+            parts = [f"{n} {label}" for label, n in (('added', counts['A']), ('changed', counts['M']), ('removed', counts['D'])) if n]
+            lines.append(f"  {top}: {', '.join(parts)}")
+        size_line = f"  download {_format_bytes(preview['download_bytes'])}, write {_format_bytes(preview['write_bytes'])}"
+        if preview['unknown']:
+            size_line += f" (+{preview['unknown']} file(s) of unknown size)"
+        if preview['download_bytes'] and preview['eta_secs'] is not None:
+            size_line += f", ETA ~{_format_duration(preview['eta_secs'])}"
+        lines.append(size_line)
+        for line in lines:
+            self.ui_callback(line, "white")
+        self.print_mod_changelog(repo, preview['base'], preview['target'], changes=preview['changes'])
+        if preview['download_bytes'] < UPDATE_CONFIRM_BYTES and not preview['unknown']:
+            return True
+        return messagebox.askyesno("Big Update", "\n".join(lines) + "\n\nDownload it now?")
 
-    def fetch_remote_branches(self):
-        """Fetch available remote branches from the repository."""
+    def fetch_from_lan_peers(self, repo, branch):
+        """Before fetching origin: if a launcher on the LAN has origin's new tip for `branch`, get the
+        objects from it. Origin is still asked for the tip, so a peer can't change what gets installed,
+        and the origin fetch afterwards only has to send what the peer didn't."""
+        # not the blind launch deadline: this is on the way to a full fetch, a slow origin is fine
         try:
-            repo = git.Repo(MINECRAFT_DEFAULT_DIR)
-            repo.remotes.origin.fetch()
-            branches = [ref.name.split("/")[-1] for ref in repo.remotes.origin.refs]
-            return branches
+            target = self.ls_remote_head(repo, branch, timeout=MIRROR_PROBE_TIMEOUT_SECS)
+        except LookupError:
+            return False  # the fetch after this reports it
+        if target is None:
+            return False
+        try:
+            repo.git.cat_file('-e', f'{target}^{{commit}}')
+            return False  # already have it
+        except git.exc.GitCommandError:
+            pass
+        for ip, port, refs in self.lan.discover():
+            ref = next((name for name, sha in refs.items() if sha == target), None)
+            if ref is None:
+                continue
+            args = ['--no-tags', '--no-write-fetch-head', '--recurse-submodules=no']
+            if _is_shallow(repo):
+                args.append(f'--depth={SHALLOW_DEPTH}')
+            t0 = time.time()
+            try:
+                self.ui_callback(f"Getting update from {ip} on your network...", "yellow")
+                repo.git.fetch(*args, f'git://{ip}:{port}/', f'+{ref}:{LAN_FETCH_REF}', env={'GIT_TERMINAL_PROMPT': '0'})
+            except git.exc.GitCommandError as e:
+                print(f"LAN fetch from {ip}:{port} failed: {e}")
+                continue
+            self.ui_callback(f"got it from {ip} in {_format_duration(time.time() - t0)}", "lime")
+            return True
+        return False
+
+    def drop_lan_fetch_ref(self, repo):
+        try:
+            repo.git.update_ref('-d', LAN_FETCH_REF)
+        except git.exc.GitCommandError:
+            pass
+
+    def update_lan_sharing(self, path):
+        """Serve `path` on the LAN if the player opted in and it's a full install, otherwise stop serving."""
+        try:
+            repo = git.Repo(path)
+            if _load_prefs(path)['lan_share'] and not (_is_shallow(repo) or _is_partial(repo)):
+                self.lan.serve(path)
+                return
         except Exception as e:
-            self.ui_callback(f"Error fetching branches: {e}", "red")
-            return ["master"]  # Default to 'master' if fetching fails
+            print(f"LAN sharing unavailable: {e}")
+        self.lan.stop()
+
+    def ls_remote_head(self, repo, branch, timeout=BLIND_LAUNCH_TIMEOUT_SECS):
+        """Ask origin for `branch`'s tip sha: ref advertisement only, no objects, killed after `timeout`.
+        Returns None if the deadline passes or the remote can't be reached; raises LookupError if
+        the remote answered but doesn't have the branch."""
+        try:
+            sha = _ls_remote_head('origin', branch, timeout, cwd=repo.working_tree_dir)
+        except git.exc.GitCommandError as e:
+            print(f"ls-remote failed or timed out: {e}")
+            return None
+        if sha is None:
+            raise LookupError(f"branch '{branch}' is not on the remote")
+        return sha
+
+    def fetch_in_background(self, path):
+        """Start a real fetch that outlives the UI (non-daemon), e.g. after a blind launch gave up waiting."""
+        def _run():
+            try:
+                self.remote.refresh(path, force=True)
+                print("background fetch done")
+            except Exception as e:
+                print(f"background fetch failed: {e}")
+        threading.Thread(target=_run, daemon=False).start()
+
+    def pull_branch(self, repo, branch, progress=None):
+        """Pull the checked out branch: a (cancellable) fetch, then a merge. Shallow installs
+        can't merge across the shallow boundary, so they move onto the new tip with reset --keep
+        (which, like a fast-forward pull, refuses to clobber local changes)."""
+        self.fetch_origin(repo, progress=progress, branch=branch)
+        if not _is_shallow(repo):
+            self.run_git_op(repo, 'merge', '--progress', '--no-edit', f'origin/{branch}', progress=progress, cancellable=False)
+        else:
+            repo.git.reset('--keep', f'origin/{branch}')
+
+    def apply_components(self, repo, components):
+        """Restrict the working tree to the chosen optional components (sparse checkout)."""
+        components = [c for c in COMPONENT_PATTERNS if c in components]
+        with repo.config_writer() as cw:
+            cw.set_value('frontier', 'components', ','.join([COMPONENT_CORE] + components))
+        self.ui_callback(f"components: {', '.join([COMPONENT_CORE] + components)}", color='yellow')
+        if len(components) == len(COMPONENT_PATTERNS):
+            repo.git.sparse_checkout('disable')
+        else:
+            repo.git.sparse_checkout('set', '--no-cone', *_sparse_patterns(components))
+
+    def get_components(self, repo):
+        """Optional components installed in this repo (all of them for installs that predate components)."""
+        with repo.config_reader() as cr:
+            stored = cr.get_value('frontier', 'components', '')
+        if not stored:
+            return list(COMPONENT_PATTERNS)
+        return [c for c in COMPONENT_PATTERNS if c in stored.split(',')]
+
+    def primary_path(self, repo):
+        """Working tree of the install whose objects this one borrows (itself for a normal install)."""
+        with repo.config_reader() as cr:
+            return Path(cr.get_value('frontier', 'primary', repo.working_tree_dir))
+
+    def list_instances(self, path):
+        """[(name, path)] of the primary install and the instances made from it."""
+        primary = self.primary_path(git.Repo(path))
+        try:
+            registry = json.loads((primary / '.git' / INSTANCES_FILE_NAME).read_text())
+        except Exception:
+            registry = {}
+        return [(PRIMARY_INSTANCE_NAME, primary)] + [(name, Path(p)) for name, p in sorted(registry.items())]
+
+    def create_instance(self, path, name, dest, branch):
+        """New install at `dest` on `branch`, sharing the primary's object store (nothing downloaded
+        for what the primary already has) and hardlinking the primary's clean files that are identical."""
+        t0 = time.time()
+        primary_repo = git.Repo(self.primary_path(git.Repo(path)))
+        primary = Path(primary_repo.working_tree_dir)
+        dest = Path(dest)
+        if name == PRIMARY_INSTANCE_NAME or name in dict(self.list_instances(primary)):
+            raise ValueError(f"there's already an instance called '{name}'")
+        if dest.exists() and any(dest.iterdir()):
+            raise ValueError(f"{dest} isn't empty")
+        target = primary_repo.git.rev_parse('--verify', f'refs/remotes/origin/{branch}^{{commit}}')
+
+        self.ui_callback(f"creating instance '{name}' at {dest}...", "yellow")
+        repo = git.Repo.init(dest)
+        (Path(repo.git_dir) / 'objects' / 'info' / 'alternates').write_text(str(Path(primary_repo.git_dir).resolve() / 'objects') + '\n')
+        if _is_shallow(primary_repo):
+            shutil.copy2(Path(primary_repo.git_dir) / 'shallow', Path(repo.git_dir) / 'shallow')
+        repo.create_remote('origin', url=primary_repo.remotes.origin.url)
+        with repo.config_writer() as cw:
+            cw.set_value('frontier', 'primary', str(primary.resolve()))
+            if _is_partial(primary_repo):  # blobs the primary never downloaded come from origin on demand
+                with primary_repo.config_reader() as cr:
+                    cw.set_value('core', 'repositoryformatversion', '1')
+                    cw.set_value('extensions', 'partialClone', 'origin')
+                    cw.set_value('remote "origin"', 'promisor', 'true')
+                    cw.set_value('remote "origin"', 'partialclonefilter', cr.get_value('remote "origin"', 'partialclonefilter', PARTIAL_CLONE_FILTER))
+        for line in primary_repo.git.for_each_ref('--format=%(objectname) %(refname)', 'refs/remotes/origin').splitlines():
+            sha, ref = line.split()
+            if not ref.endswith('/HEAD'):
+                repo.git.update_ref(ref, sha)
+        repo.git.branch('--track', branch, f'origin/{branch}')
+        repo.git.symbolic_ref('HEAD', f'refs/heads/{branch}')
+        components = self.get_components(primary_repo)
+        self.apply_components(repo, components)  # index is still empty, so this writes nothing
+        repo.git.reset('-q', branch)  # index only
+        if len(components) != len(COMPONENT_PATTERNS):
+            repo.git.sparse_checkout('reapply')
+
+        # hardlink what the primary has clean and identical, write the rest from objects
+        primary_oids = {}
+        for entry in primary_repo.git.ls_files('-s', '-z').split('\0'):
+            meta, _, p = entry.partition('\t')
+            if p:
+                primary_oids[p] = meta.split()[1]
+        primary_dirty = set(primary_repo.git.diff('--name-only', '-z').split('\0'))
+        linked = linked_bytes = 0
+        for entry in repo.git.ls_tree('-r', '-z', target).split('\0'):
+            meta, _, p = entry.partition('\t')
+            if not p or not p.lower().endswith(HARDLINK_SUFFIXES) or _excluded_by_components(p, components):
+                continue
+            if primary_oids.get(p) != meta.split()[2] or p in primary_dirty:
+                continue
+            (dest / p).parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(primary / p, dest / p)
+            except OSError as e:
+                print(f"hardlinking stopped ({e}), writing copies instead")
+                break
+            linked += 1
+            linked_bytes += (dest / p).stat().st_size
+        repo.git.update_index('-q', '--refresh')  # linked files now count as up to date...
+        repo.git.checkout('--', '.')            # ...so this only writes the rest
+        primary_repo.git.update_ref(INSTANCE_PIN_REF_PREFIX + name, target)
+
+        registry_path = Path(primary_repo.git_dir) / INSTANCES_FILE_NAME
+        registry = dict(self.list_instances(primary)[1:])
+        registry[name] = dest.resolve()
+        registry_path.write_text(json.dumps({n: str(p) for n, p in registry.items()}, indent=2))
+        self.ui_callback(f"Instance '{name}' ready in {time.time() - t0:.1f}s: {linked} files ({_format_bytes(linked_bytes)}) shared with {PRIMARY_INSTANCE_NAME}", "lime")
+        return dest
+
+    def _branch_cache_root(self, repo):
+        return Path(repo.git_dir) / BRANCH_CACHE_DIR_NAME
+
+    def _branch_cache_entry(self, repo, branch):
+        # quoted, so 'feature/x' is one flat entry instead of nesting under 'feature'
+        return self._branch_cache_root(repo) / urllib.parse.quote(branch, safe='')
+
+    def _in_branch_cache_dirs(self, path):
+        return path.split('/', 1)[0] in BRANCH_CACHE_DIRS
+
+    def _cached_changes(self, repo, old, new):
+        """{path: status} for the tracked files inside BRANCH_CACHE_DIRS that differ between two commits."""
+        return {path: status for status, path, _ in _diff_raw(repo, old, new, *BRANCH_CACHE_DIRS)}
+
+    def _cache_meta(self, entry):
+        try:
+            return json.loads((entry / 'meta.json').read_text())
+        except Exception:
+            return None
+
+    def _stash_current_branch(self, repo, changes):
+        """Move the active branch's side of `changes` (tracked files only) and its index into the
+        branch cache. Files git doesn't track -- the player's own packs, shader settings, extra
+        mods -- never leave the install."""
+        root = Path(repo.working_tree_dir)
+        entry = self._branch_cache_entry(repo, repo.active_branch.name)
+        shutil.rmtree(entry, ignore_errors=True)
+        entry.mkdir(parents=True)
+        shutil.copy2(Path(repo.git_dir) / 'index', entry / 'index')
+        (entry / 'meta.json').write_text(json.dumps({
+            'branch': repo.active_branch.name,
+            'commit': repo.head.commit.hexsha,
+            'components': self.get_components(repo),
+            'used_at': time.time(),
+        }))
+        for path, status in changes.items():
+            if status != 'A' and (root / path).is_file():
+                _move_file(root / path, entry / 'files' / path)
+                if status == 'D':
+                    _remove_empty_parents(root, path)
+
+    def _evict_branch_cache(self, repo):
+        # entries only hold copies of tracked files, so dropping one loses nothing git can't rebuild
+        root = self._branch_cache_root(repo)
+        if not root.is_dir():
+            return
+        entries = sorted(root.iterdir(), key=lambda e: (self._cache_meta(e) or {}).get('used_at', 0), reverse=True)
+        for entry in entries[BRANCH_CACHE_MAX:]:
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def _switch_through_cache(self, repo, branch, commit, changes, restore):
+        """Stash the active branch, then either move `branch`'s cached files in (restore=True) or let
+        git check it out. The switch is recorded in the journal, so a crash part way is undone or
+        finished on the next start (_recover_branch_switch); an error here is undone right away."""
+        journal = _read_journal(repo) or {'op': 'branch switch', 'started': datetime.datetime.now().isoformat(timespec='seconds')}
+        switch = {'from': repo.active_branch.name, 'to': branch, 'old_head': repo.head.commit.hexsha, 'commit': commit}
+        _write_journal(repo, journal, branch_switch=switch)
+        try:
+            self._stash_current_branch(repo, changes)
+            if restore:
+                root, files = Path(repo.working_tree_dir), self._branch_cache_entry(repo, branch) / 'files'
+                for path, status in changes.items():
+                    if status != 'D':
+                        _move_file(files / path, root / path)
+                shutil.copy2(self._branch_cache_entry(repo, branch) / 'index', Path(repo.git_dir) / 'index')
+                repo.git.symbolic_ref('HEAD', f'refs/heads/{branch}')
+                self._finish_branch_switch(repo, switch)
+            else:
+                repo.git.checkout(branch)
+        except Exception:
+            self._recover_branch_switch(repo, switch)  # if this fails too, the journal stays for the next start
+            self._drop_branch_switch(repo, journal)
+            raise
+        self._drop_branch_switch(repo, journal)
+
+    def _drop_branch_switch(self, repo, journal):
+        del journal['branch_switch']
+        if journal['op'] == 'branch switch':
+            _clear_journal(repo)
+        else:
+            _write_journal(repo, journal)
+
+    def _restore_cached_branch(self, repo, branch):
+        """Switch to `branch` from the cache: only the tracked files that differ between the two
+        branches are moved, then the rest is fixed up against its saved index. False if there's no
+        usable cache entry, or a file of the player's is where the branch keeps one."""
+        entry = self._branch_cache_entry(repo, branch)
+        meta = self._cache_meta(entry)
+        if meta is None:
+            return False
+        if meta['commit'] != repo.git.rev_parse(f'refs/heads/{branch}') or meta['components'] != self.get_components(repo):
+            shutil.rmtree(entry, ignore_errors=True)  # the branch moved or the components changed since
+            return False
+        root = Path(repo.working_tree_dir)
+        changes = self._cached_changes(repo, 'HEAD', meta['commit'])
+        if any(status != 'D' and not (entry / 'files' / path).is_file() for path, status in changes.items()):
+            shutil.rmtree(entry, ignore_errors=True)  # stashed against a different branch, doesn't cover this switch
+            return False
+        if any(status == 'A' and (root / path).exists() for path, status in changes.items()):
+            return False  # untracked file in the way: leave it to git's checkout to say so
+        self._switch_through_cache(repo, branch, meta['commit'], changes, restore=True)
+        return True
+
+    def _checkout_outdated(self, repo):
+        """Rewrite the tracked files that don't match the index."""
+        repo.git.update_index('-q', '--refresh')
+        outdated = [p for p in repo.git.diff('--name-only', '-z').split('\0') if p]
+        for batch in _chunks(outdated, 200):
+            repo.git.checkout('--', *batch)
+
+    def _finish_branch_switch(self, repo, switch):
+        """After HEAD moved to the cached branch: fix the files outside the cached folders."""
+        root = Path(repo.working_tree_dir)
+        for status, path, _ in _diff_raw(repo, switch['old_head'], switch['commit']):
+            if status == 'D' and not self._in_branch_cache_dirs(path):
+                (root / path).unlink(missing_ok=True)
+        self._checkout_outdated(repo)
+        shutil.rmtree(self._branch_cache_entry(repo, switch['to']), ignore_errors=True)
+
+    def _recover_branch_switch(self, repo, switch):
+        """A branch cache switch was cut short. If HEAD already moved, finish it; otherwise move the
+        old branch's files and index back (and the new branch's files back into its entry). Only
+        tracked files are moved; nothing of the player's was in the way when the switch started."""
+        if not repo.head.is_detached and repo.active_branch.name == switch['to']:
+            self._finish_branch_switch(repo, switch)
+            return
+        root = Path(repo.working_tree_dir)
+        stashed, entry = self._branch_cache_entry(repo, switch['from']), self._branch_cache_entry(repo, switch['to'])
+        for path, status in self._cached_changes(repo, switch['old_head'], switch['commit']).items():
+            if status == 'A':
+                if (root / path).is_file():
+                    _move_file(root / path, entry / 'files' / path)
+                    _remove_empty_parents(root, path)
+            elif (stashed / 'files' / path).is_file():
+                if (root / path).is_file():
+                    _move_file(root / path, entry / 'files' / path)
+                _move_file(stashed / 'files' / path, root / path)
+        if (stashed / 'index').exists():
+            shutil.copy2(stashed / 'index', Path(repo.git_dir) / 'index')
+        shutil.rmtree(stashed, ignore_errors=True)  # its files are back in place
+        self._checkout_outdated(repo)
+
+    def checkout_branch(self, repo, branch):
+        """`git checkout branch`, through the branch cache if the player turned it on."""
+        if (repo.head.is_detached or repo.active_branch.name == branch or repo.is_dirty()
+                or not _load_prefs(repo.working_tree_dir)['branch_cache']):
+            repo.git.checkout(branch)
+            return
+        t0 = time.time()
+        if self._restore_cached_branch(repo, branch):
+            self.ui_callback(f"switched to {branch} from the branch cache in {time.time() - t0:.2f}s", "lime")
+        else:
+            try:
+                target = repo.git.rev_parse('--verify', '-q', f'refs/heads/{branch}')
+            except git.exc.GitCommandError:
+                repo.git.checkout(branch)  # no local branch yet, nothing to cache against
+                return
+            changes = self._cached_changes(repo, 'HEAD', target)
+            root = Path(repo.working_tree_dir)
+            if any(status == 'A' and (root / path).exists() for path, status in changes.items()):
+                repo.git.checkout(branch)  # untracked file in the way: git refuses and says which
+                return
+            # the files git is about to rewrite are moved into the cache instead of thrown away
+            self._switch_through_cache(repo, branch, target, changes, restore=False)
+        self._evict_branch_cache(repo)
+
+    def _staging_paths(self, repo):
+        git_dir = Path(repo.git_dir)
+        return git_dir / STAGING_DIR_NAME, git_dir / STAGING_MANIFEST_NAME
+
+    def discard_staged_update(self, repo):
+        staging, manifest_path = self._staging_paths(repo)
+        shutil.rmtree(staging, ignore_errors=True)
+        manifest_path.unlink(missing_ok=True)
+        (Path(repo.git_dir) / STAGING_INDEX_NAME).unlink(missing_ok=True)
+
+    def _fetch_blobs_paced(self, repo, oids, rate_limit_kbps):
+        """Download blobs by id in batches, sleeping between batches to keep the average rate under the cap."""
+        pack_dir = Path(repo.git_dir) / 'objects' / 'pack'
+        for batch in _chunks(oids, STAGE_BATCH_SIZE):
+            t0 = time.time()
+            size0 = _dir_size(pack_dir)
+            # noop negotiation, like git's own lazy fetch: otherwise the server assumes we
+            # already have every blob reachable from the commits we advertise
+            repo.git(c='fetch.negotiationAlgorithm=noop').fetch(
+                '--no-tags', '--no-write-fetch-head', '--recurse-submodules=no',
+                f'--filter={PARTIAL_CLONE_FILTER}', 'origin', *batch)
+            if rate_limit_kbps:
+                wait = (_dir_size(pack_dir) - size0) / (rate_limit_kbps * 1024) - (time.time() - t0)
+                if wait > 0:
+                    time.sleep(wait)
+
+    def stage_update(self, repo_path, rate_limit_kbps=0):
+        """Download the next update and lay its changed files out in a staging tree under .git,
+        so the next launch only has to swap them in (see apply_staged_update). Meant to run while
+        the game is up. On partial (quick) installs blobs come down in paced batches under
+        rate_limit_kbps; full installs get everything in the one fetch. Returns True if staged."""
+        repo = git.Repo(repo_path)
+        branch = repo.active_branch.name
+        self.discard_staged_update(repo)
+        self.fetch_origin(repo)
+        base = repo.head.commit.hexsha
+        target = repo.remotes.origin.refs[branch].commit.hexsha
+        if base == target:
+            print("staging: already up to date")
+            return False
+
+        components = self.get_components(repo)
+        changes = [c for c in _diff_raw(repo, base, target) if not _excluded_by_components(c[1], components)]
+        staged = [path for status, path, _ in changes if status != 'D']
+        if _is_partial(repo):
+            wanted = {oid for status, _, oid in changes if status != 'D'}
+            listing = repo.git.rev_list('--objects', '--missing=print', '--no-object-names', target)
+            missing = [line[1:] for line in listing.splitlines() if line.startswith('?') and line[1:] in wanted]
+            print(f"staging: downloading {len(missing)} objects (cap {rate_limit_kbps or 'none'} KB/s)")
+            self._fetch_blobs_paced(repo, missing, rate_limit_kbps)
+
+        staging, manifest_path = self._staging_paths(repo)
+        env = {'GIT_INDEX_FILE': str(Path(repo.git_dir) / STAGING_INDEX_NAME)}
+        repo.git.read_tree(target, env=env)
+        for batch in _chunks(staged, 200):
+            repo.git.checkout_index('-f', f'--prefix={staging.as_posix()}/', '--', *batch, env=env)
+        (Path(repo.git_dir) / STAGING_INDEX_NAME).unlink()
+        manifest_path.write_text(json.dumps({'branch': branch, 'base': base, 'target': target, 'changes': changes}))
+        print(f"staging: {target[:7]} staged ({len(changes)} files)")
+        return True
+
+    def apply_staged_update(self, repo_path):
+        """Swap a staged update into the install: renames only, then moves the branch onto the
+        staged commit and restores anything that doesn't match from local objects. Skips (and
+        drops) the stage if HEAD moved or the player edited files it touches. Returns True if applied."""
+        repo = git.Repo(repo_path)
+        staging, manifest_path = self._staging_paths(repo)
+        if not manifest_path.exists():
+            return False
+        manifest = json.loads(manifest_path.read_text())
+        target = manifest['target']
+        changes = manifest['changes']
+        paths = [path for _, path, _ in changes]
+
+        if not manifest.get('applying'):  # a previous apply got interrupted -> just finish it
+            if repo.head.is_detached or repo.active_branch.name != manifest['branch'] or repo.head.commit.hexsha != manifest['base']:
+                print("staged update is stale, dropping it")
+                self.discard_staged_update(repo)
+                return False
+            dirty = set()
+            for batch in _chunks(paths, 200):
+                dirty.update(repo.git.diff('--name-only', '-z', 'HEAD', '--', *batch).split('\0'))
+            dirty.discard('')
+            if dirty:
+                self.ui_callback(f"Skipping staged update: you changed {len(dirty)} file(s) it touches. Use Update instead.", "orange")
+                self.discard_staged_update(repo)
+                return False
+            # quick consistency check: every staged file is there with the size git expects
+            sizes = {}
+            for batch in _chunks(paths, 200):
+                for entry in repo.git.ls_tree('-r', '-l', '-z', target, '--', *batch).split('\0'):
+                    meta, _, path = entry.partition('\t')
+                    if path:
+                        sizes[path] = meta.split()[3]
+            for status, path, _ in changes:
+                if status == 'D':
+                    continue
+                staged_file = staging / path
+                if not os.path.lexists(staged_file) or str(os.lstat(staged_file).st_size) != sizes.get(path):
+                    print(f"staged file {path} is missing or incomplete, dropping the stage")
+                    self.discard_staged_update(repo)
+                    return False
+            manifest['applying'] = True
+            manifest_path.write_text(json.dumps(manifest))
+
+        exe_path = Path(repo_path) / LAUNCHER_EXE_NAME
+        if LAUNCHER_EXE_NAME in paths and get_current_os() == OS_WIN and exe_path.exists():
+            # windows can rename the running exe but not replace it; bootup_seq cleans up the .old
+            exe_old_path = exe_path.with_suffix('.exe.old')
+            exe_old_path.unlink(missing_ok=True)
+            exe_path.rename(exe_old_path)
+        for status, path, _ in changes:
+            dest = Path(repo_path) / path
+            if status == 'D':
+                dest.unlink(missing_ok=True)
+                continue
+            src = staging / path
+            if not os.path.lexists(src):
+                continue  # already moved in by an interrupted apply
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(src, dest)
+        repo.git.reset('-q', target)
+
+        leftovers = set()
+        for batch in _chunks(paths, 200):
+            leftovers.update(repo.git.diff('--name-only', '-z', 'HEAD', '--', *batch).split('\0'))
+        leftovers.discard('')
+        for batch in _chunks(sorted(leftovers), 200):
+            repo.git.checkout('HEAD', '--', *batch)
+        self.discard_staged_update(repo)
+        self.ui_callback(f"Applied staged update {target[:7]} ({len(changes)} files{f', {len(leftovers)} restored' if leftovers else ''})", "lime")
+        self.hooks.run(repo, manifest['base'], target)
+        return True
+
+    def mark_launch(self, path):
+        """Remember what's being launched; the next start decides whether it worked (see settle_launch)."""
+        try:
+            repo = git.Repo(path)
+            repo.git.config(PENDING_LAUNCH_KEY, f"{repo.head.commit.hexsha} {int(time.time())}")
+        except Exception as e:
+            print(f"couldn't record launch: {e}")
+
+    def take_pending_launch(self, repo):
+        """(sha, launched_at) of the last unjudged launch, clearing it, or None."""
+        try:
+            pending = repo.git.config('--get', PENDING_LAUNCH_KEY)
+        except git.exc.GitCommandError:
+            return None
+        repo.git.config('--unset', PENDING_LAUNCH_KEY)
+        sha, launched_at = pending.split()
+        return sha, int(launched_at)
+
+    def mark_known_good(self, repo, sha):
+        repo.git.update_ref(LAST_KNOWN_GOOD_REF, sha)
+
+    def last_known_good(self, repo):
+        try:
+            return repo.git.rev_parse('--verify', '-q', f'{LAST_KNOWN_GOOD_REF}^{{commit}}')
+        except git.exc.GitCommandError:
+            return None
+
+    def rollback_to_last_known_good(self, repo_path):
+        """Move the install back to the last commit that launched without crashing. Everything
+        comes from local objects, no fetch."""
+        repo = git.Repo(repo_path)
+        good = self.last_known_good(repo)
+        if good is None:
+            self.ui_callback("No launch has been recorded as working yet, nothing to roll back to.", "orange")
+            return False
+        old_head = repo.head.commit.hexsha
+        if good == old_head:
+            self.ui_callback(f"Already on {good[:7]}, the last version that worked.", "lime")
+            return False
+        if not messagebox.askokcancel('Roll Back',
+                f'Go back to {good[:7]}, the last version that launched without crashing?\n\n'
+                'Nothing is downloaded. Your saves and untracked files are not affected.\n'
+                'Press Update later to move forward again.'):
+            return False
+        t0 = time.time()
+        self.discard_staged_update(repo)
+        try:
+            repo.git.reset('--keep', good)
+        except git.exc.GitCommandError:
+            if not messagebox.askokcancel('Roll Back', 'Some files you changed are different in that version and will be reset.\nContinue?'):
+                return False
+            repo.git.reset('--hard', good)
+        self.hooks.run(repo, old_head, good)
+        self.ui_callback(f"Rolled back {old_head[:7]} -> {good[:7]} in {time.time() - t0:.2f}s", "lime")
+        return True
 
     def print_status(self, message, color="white"):
         """Send a status message to the UI console."""
@@ -462,12 +2579,13 @@ class GitBackend:
             commit_date = datetime.datetime.fromtimestamp(commit.committed_date).strftime("%m-%d-%Y %H:%M")
 
             # Log branch, commit hash, and date
-            status_message = f">> status: on branch '{branch}'\n>> commit: {commit.hexsha[:7]} ({'dirty' if len(repo.index.diff(None))!=0 else 'clean'}) \"{commit.message}\" <{commit_date}>"
+            changes = repo.index.diff(None)
+            status_message = f">> status: on branch '{branch}'\n>> commit: {commit.hexsha[:7]} ({'dirty' if changes else 'clean'}) \"{commit.message}\" <{commit_date}>"
 
             self.ui_callback(status_message, color="pink")
 
             if v:
-                for item in repo.index.diff(None):
+                for item in changes:
                     clr = ''
                     match item.change_type:
                         case 'M':
@@ -480,16 +2598,17 @@ class GitBackend:
                             clr = 'orange'
                     self.ui_callback(f'>> [{item.change_type}] {item.a_path}', clr)
 
-            # Fetch remote changes
+            # Compare local and remote branch commits (shared, cached fetch)
             self.ui_callback("Checking for new remote versions...", color="yellow")
-            repo.remotes.origin.fetch()
-
-            # Compare local and remote branch commits
-            remote_branch = repo.remotes.origin.refs[branch]
-            if commit.hexsha == remote_branch.commit.hexsha:
+            remote_sha = self.remote.remote_head(path, branch)
+            if remote_sha is None:
+                self.ui_callback(f"Branch '{branch}' is not on the remote", color="orange")
+            elif commit.hexsha == remote_sha:
                 self.ui_callback(f"You are up-to-date with version '{branch}'", color='lime')
             else:
-                self.ui_callback(f"!! A newer version {remote_branch.commit.hexsha[:7]} is available on the remote branch '{branch}'", color="orange")
+                _ahead, behind = self.remote.ahead_behind(repo, branch)
+                self.ui_callback(f"!! A newer version {remote_sha[:7]} is available on the remote branch '{branch}' ({behind} commit(s) behind)", color="orange")
+                self.print_mod_changelog(repo, commit.hexsha, remote_sha)
 
         except git.exc.InvalidGitRepositoryError:
             self.ui_callback("Invalid Git repository. Please check the path.", color="red")
@@ -498,24 +2617,160 @@ class GitBackend:
         except Exception as e:
             self.ui_callback(f"Unexpected error: {e}", color="red")
 
-    def run_in_thread(self, target, *args):
-        """Run a function in a separate thread with semaphore protection."""
-        def wrapper():
-            if not self.semaphore.acquire(blocking=False):
-                messagebox.showinfo("Console Busy", "A task is already running. Please wait.")
+    def verify_install(self, path):
+        """Compare the working tree with HEAD by blob id. Files whose size and mtime match the cache
+        aren't read; the rest are hashed in a thread pool. Raw hashes that don't match are rechecked
+        with `git hash-object`, which applies line-ending conversion, before counting as modified.
+        Returns (modified, missing, extra)."""
+        t0 = time.time()
+        repo = git.Repo(path)
+        root = Path(repo.working_tree_dir)
+        components = self.get_components(repo)
+        expected = {}
+        for entry in repo.git.ls_tree('-r', '-z', 'HEAD').split('\0'):
+            meta, _, p = entry.partition('\t')
+            if p and meta.split()[0] not in ('120000', '160000') and not _excluded_by_components(p, components):
+                expected[p] = meta.split()[2]
+
+        cache_path = Path(repo.git_dir) / VERIFY_CACHE_NAME
+        try:
+            cache = json.loads(cache_path.read_text())
+        except Exception:
+            cache = {}
+        missing, stats, to_hash, actual = [], {}, [], {}
+        for p in expected:
+            try:
+                st = os.stat(root / p)
+            except FileNotFoundError:
+                missing.append(p)
+                continue
+            stats[p] = (st.st_size, st.st_mtime_ns)
+            hit = cache.get(p)
+            if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+                actual[p] = hit[2]
+            else:
+                to_hash.append(p)
+        to_hash.sort(key=lambda p: stats[p][0], reverse=True)  # big jars first so the pool stays busy
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as pool:
+            actual.update(zip(to_hash, pool.map(lambda p: _git_blob_hash(root / p), to_hash)))
+        mismatched = [p for p in to_hash if actual[p] != expected[p]]
+        for batch in _chunks(mismatched, 200):
+            for p, oid in zip(batch, repo.git.hash_object('--', *batch).split()):
+                actual[p] = oid
+        modified = sorted(p for p in stats if actual[p] != expected[p])
+
+        now_ns = time.time_ns()
+        cache = {p: [size, mtime, actual[p]] for p, (size, mtime) in stats.items()
+                 if now_ns - mtime > VERIFY_RACY_SECS * 1_000_000_000}
+        cache_path.write_text(json.dumps(cache))
+
+        extra = []
+        for d in VERIFY_EXTRA_DIRS:
+            for dirpath, _dirnames, filenames in os.walk(root / d):
+                for name in filenames:
+                    p = Path(dirpath, name).relative_to(root).as_posix()
+                    if p not in expected and not _excluded_by_components(p, components):
+                        extra.append(p)
+        extra.sort()
+
+        self._report_paths("modified", modified, "orange")
+        self._report_paths("missing", sorted(missing), "red")
+        self._report_paths("extra (not part of the pack)", extra, "yellow")
+        summary = f"verified {len(expected)} files in {time.time() - t0:.2f}s ({len(to_hash)} hashed)"
+        if modified or missing or extra:
+            self.ui_callback(f"{summary}. Update in 'repair' mode puts the pack files back.", "orange")
+        else:
+            self.ui_callback(f"{summary}: everything matches {repo.head.commit.hexsha[:7]}", "lime")
+        return modified, sorted(missing), extra
+
+    def maintenance_due(self, repo):
+        with repo.config_reader() as cr:
+            last = float(cr.get_value('frontier', 'lastMaintenance', 0))
+        return time.time() - last > MAINTENANCE_INTERVAL_SECS
+
+    def _maintenance_probe(self, repo):
+        """What maintenance should make faster: a status scan, a history walk, and the object count."""
+        t0 = time.time()
+        repo.git.status('--porcelain')
+        t1 = time.time()
+        repo.git.rev_list('--count', '--all')
+        t2 = time.time()
+        counts = dict(line.split(': ') for line in repo.git.count_objects('-v').splitlines())
+        return {'status_secs': round(t1 - t0, 3), 'rev_list_secs': round(t2 - t1, 3),
+                'loose_objects': int(counts['count']), 'packs': int(counts['packs'])}
+
+    def _maintenance_steps(self, repo):
+        steps = [
+            ('untracked cache', lambda: (repo.git.config('core.untrackedCache', 'true'), repo.git.update_index('--untracked-cache'))),
+            ('commit-graph', lambda: repo.git.commit_graph('write', '--reachable', '--changed-paths')),
+            ('pack refs', lambda: repo.git.pack_refs('--all')),
+            # geometric repack only rewrites the small packs; the midx makes the rest one lookup
+            ('repack', lambda: repo.git.repack('-d', '-l', '--geometric=2', '--write-midx')),
+            ('loose objects', lambda: repo.git.prune_packed()),
+        ]
+        if len(self.list_instances(repo.working_tree_dir)) == 1 and self.primary_path(repo).resolve() == Path(repo.working_tree_dir).resolve():
+            # old launcher exes and other blobs left behind by shallow updates become unreachable
+            # once the reflog lets go of them. Skipped when instances borrow these objects. Plain
+            # `git prune` expires everything, so it gets gc's grace period: a fetch running outside the
+            # scheduler (e.g. after a blind launch) may have written loose objects no ref points at yet.
+            with repo.config_reader() as cr:
+                expire = cr.get_value('gc', 'pruneExpire', PRUNE_EXPIRE_DEFAULT)
+            steps.append(('prune', lambda: (repo.git.reflog('expire', '--expire-unreachable=now', '--all'),
+                                            repo.git.prune(f'--expire={expire}'))))
+        return steps
+
+    def run_maintenance(self, path, locked=False, force=False):
+        """Run the maintenance steps if due. Each step takes the scheduler's write slot only if
+        nothing else is running or queued, so maintenance never delays a button press by more
+        than the step in progress. locked=True: the caller is a write task and already has the repo."""
+        try:
+            repo = git.Repo(path)
+        except Exception:
+            return
+        if not force and not self.maintenance_due(repo):
+            return
+        before = self._maintenance_probe(repo)
+        timings = {}
+        for name, step in self._maintenance_steps(repo):
+            if not locked and not self.tasks.try_hold():
+                print(f"maintenance: deferred at '{name}', something else needs the repo")
                 return
+            t0 = time.time()
             try:
-                target(*args)
+                step()
+            except git.exc.GitCommandError as e:
+                print(f"maintenance step '{name}' failed: {e}")
             finally:
-                self.semaphore.release()
-        thread = threading.Thread(target=wrapper, daemon=False)
-        thread.start()
+                timings[name] = round(time.time() - t0, 3)
+                if not locked:
+                    self.tasks.release_hold()
+        after = self._maintenance_probe(repo)
+        with repo.config_writer() as cw:
+            cw.set_value('frontier', 'lastMaintenance', str(int(time.time())))
+        log_path = Path(repo.git_dir) / MAINTENANCE_LOG_NAME
+        try:
+            log = json.loads(log_path.read_text())
+        except Exception:
+            log = []
+        log.append({'at': datetime.datetime.now().isoformat(timespec='seconds'), 'steps': timings, 'before': before, 'after': after})
+        log_path.write_text(json.dumps(log[-MAINTENANCE_LOG_KEEP:], indent=2))
+        print(f"maintenance done: {timings}, status {before['status_secs']}s -> {after['status_secs']}s, "
+              f"packs {before['packs']} -> {after['packs']}, loose {before['loose_objects']} -> {after['loose_objects']}")
+
+    def run_in_thread(self, target, *args, kind=TASK_WRITE, priority=TASK_PRIORITY_NORMAL, name=None):
+        """Queue target(*args) on the task scheduler; it runs on its own thread once the repo is free for it."""
+        return self.tasks.submit(target, *args, kind=kind, priority=priority, name=name)
+
+    def cancel_tasks(self):
+        """Cancel button: drop queued tasks and stop running downloads. Returns (dropped, downloads stopped)."""
+        dropped, _running = self.tasks.cancel()
+        return len(dropped), self.cancel_git_ops()
 
     def check_repo(self, path):
         """Check if the path is a valid Git repository."""
         try:
             repo = git.Repo(path)
-            if repo.remotes.origin.url in [REPO_URL, REPO_URL_SSH]:
+            if repo.remotes.origin.url in self.mirrors.known_urls(path):
                 return repo
             else:
                 self.print_status("Remote URL does not match the expected repository.", "red")
@@ -527,77 +2782,190 @@ class GitBackend:
             self.print_status(f"Error checking repository: {e}", "red")
             return None
         
-    def install_remote_at(self, path):
-        def progress_cb_cci(op_code, cur_count, max_count=None, message=""):
-            """Handles progress updates."""
-            progress_message = format_progress(cur_count, max_count, message)
-            self.print_status(progress_message, "cyan")
-            if max_count is not None:
-                self.ui_bar_callback(cur_count, max_count)
-    
+    def install_remote_at(self, path, mode=INSTALL_MODE_QUICK, components=None):
+        # quick installs only fetch trees up front; the files come down during checkout
+        steps = [('fetch', 0.2), ('checkout', 0.8)] if mode == INSTALL_MODE_QUICK else [('fetch', 0.85), ('checkout', 0.15)]
+        progress = GitProgress(self.print_status, self.ui_bar_callback, steps)
         self.ui_callback(f"init'ing git repo at {path}", color='yellow')
-        repo = git.Repo.init(path)
-        self.ui_callback(f"adding remote url {REPO_URL}", color='yellow')
-        origin = repo.create_remote("origin", url=REPO_URL)
+        repo = git.Repo.init(path)  # also used to resume an interrupted install, so everything here can run twice
+        journal = {'op': 'install', 'started': datetime.datetime.now().isoformat(timespec='seconds'),
+                   'mode': mode, 'components': components, 'step': 'fetch'}
+        _write_journal(repo, journal)
+        if 'origin' not in repo.remotes:
+            self.ui_callback(f"adding remote url {REPO_URL}", color='yellow')
+            repo.create_remote("origin", url=REPO_URL)
+        bundle = _find_seed_bundle(path)
+        if bundle is not None:
+            self.seed_from_bundle(repo, bundle)
         self.ui_callback(f"fetching remote on network...", color='yellow')
-        time.sleep(1)
-        origin.fetch(progress=progress_cb_cci)
+        progress.start('fetch')
+        try:
+            if bundle is not None:
+                self.run_git_op(repo, 'fetch', '--progress', 'origin', progress=progress)  # history is local already, only the delta comes down
+            elif mode == INSTALL_MODE_QUICK:
+                self.run_git_op(repo, 'fetch', '--progress', f'--depth={SHALLOW_DEPTH}', f'--filter={PARTIAL_CLONE_FILTER}', 'origin', progress=progress)
+            else:
+                self.run_git_op(repo, 'fetch', '--progress', 'origin', progress=progress)
+        except git.exc.GitCommandError as e:
+            if bundle is None:
+                raise
+            self.ui_callback(f"couldn't reach {REPO_URL}, installing the seed's version. Update once you're online.", color='orange')
+            print(f"fetch after seed failed: {e}")
+        self.remote.record(repo)
+        _write_journal(repo, journal, step='checkout')
         self.ui_callback(f"done. installing..")
+        if components is not None:
+            self.apply_components(repo, components)
+        progress.start('checkout')
         try:
-            repo.git.checkout(MAIN_BRANCH_NAME)
+            self.run_git_op(repo, 'checkout', '--progress', MAIN_BRANCH_NAME, progress=progress, cancellable=False)
         except git.exc.GitCommandError as e:
             response = messagebox.askokcancel("WARNING: Overwrite files", f"you already have an install I don't know about and the files listed below would be overwritten by installing this modpack. Continue if you are ok with this, or cancel and back up / move your old files. From git: {e}")
             if response:
                 self.ui_callback(f'forcing overwrites...', color='orange')
                 repo.git.checkout(MAIN_BRANCH_NAME, force=True)
             else:
+                _clear_journal(repo)
                 return False
+        progress.done()
+        _clear_journal(repo)
         return True
 
 
+    def seed_from_bundle(self, repo, bundle):
+        """Load origin's branches from a seed bundle (see create_seed_bundle)."""
+        self.ui_callback(f"reading seed {bundle.name}...", color='yellow')
+        repo.git.fetch(str(bundle), '+refs/remotes/origin/*:refs/remotes/origin/*')
+
+    def create_seed_bundle(self, repo_path, dest):
+        """Write this install's origin branches (after a fresh fetch if online) to a bundle other
+        players can install from. Needs a full install: quick ones are missing history and files."""
+        repo = git.Repo(repo_path)
+        if _is_shallow(repo) or _is_partial(repo):
+            self.ui_callback("Seeds can only be made from a full install (this one is a quick install).", "orange")
+            return False
+        try:
+            self.fetch_origin(repo)
+        except Exception as e:
+            self.ui_callback(f"Couldn't fetch ({e}), the seed will have what this install already has.", "orange")
+        refs = [ref.path for ref in repo.remotes.origin.refs if ref.remote_head != 'HEAD']
+        self.ui_callback(f"writing seed to {dest}...", "yellow")
+        repo.git.bundle('create', str(dest), *refs)
+        self.ui_callback(f"Seed ready: {dest} ({_format_bytes(Path(dest).stat().st_size)}). Put it next to the launcher on the new PC.", "lime")
+        return True
+
     def fetch_remote_branches(self, path):
         """Fetch available remote branches."""
         try:
-            repo = git.Repo(path)
-            repo.remotes.origin.fetch()
-            branches = [ref.name.split("/")[-1] for ref in repo.remotes.origin.refs]
-            return branches
+            return self.remote.branches(path)
         except Exception as e:
             self.ui_callback(f"Error fetching branches: {e}", "red")
             return ["master"]
 
-    def install_repo(self, path):
-        """Clone the repo into the specified directory with progress updates."""
-        def progress_callback(op_code, cur_count, max_count=None, message=""):
-            """Handles progress updates."""
-            progress_message = format_progress(cur_count, max_count, message)
-            self.print_status(progress_message, "cyan")
-            if max_count is not None:
-                self.ui_bar_callback(cur_count, max_count)
-
-        self.print_status(f"Cloning repository into {path}...", "yellow")
-
+    def install_repo(self, path, mode=INSTALL_MODE_QUICK, components=None):
+        """Install the pack into the specified directory with progress updates."""
+        # init + fetch + checkout rather than clone: the fetch can be cancelled, and an
+        # interrupted install is resumed from its journal (see recover_interrupted)
+        bundle = _find_seed_bundle(path)
+        if bundle is not None:
+            self.print_status(f"Found seed {bundle}, installing from it", "yellow")
+        else:
+            self.print_status(f"Installing into {path} ({mode} install)...", "yellow")
         try:
-            self.print_status(f"Cloning branch into {path}...", "yellow")
-            git.Repo.clone_from(REPO_URL, path, progress=progress_callback)
-            self.print_status("Clone successful!", 'lime')
+            Path(path).mkdir(parents=True, exist_ok=True)
+            if self.install_remote_at(path, mode, components):
+                self.print_status("Install successful!", 'lime')
+        except OperationCancelled:
+            _clear_journal(git.Repo(path))
+            self.print_status("Install cancelled. Press Install again to start over.", "orange")
         except Exception as e:
-            self.print_status(f"Clone failed: {e}", "red")
+            self.print_status(f"Install failed: {e}. Restart the launcher to pick up where it stopped.", "red")
+
+    def _dated_quarantine_dir(self, repo):
+        return Path(repo.working_tree_dir) / QUARANTINE_DIR_NAME / datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S")
+
+    def _backup_file(self, repo, path, data, backup_root):
+        dest = backup_root / path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(data)
+
+    def save_local_settings(self, repo, target):
+        """Before a 'preserve' update: for files the player changed that the update also changes,
+        remember (upstream base, local) text of key/value configs and back up anything else, then
+        reset just those files so the update can go through. Files the update doesn't touch keep
+        their local changes as they are. Returns {path: (base, ours)} for restore_local_settings."""
+        modified = {p for p in repo.git.diff('--name-only', '-z', '--diff-filter=M', 'HEAD').split('\0') if p}
+        touched = sorted(modified & {path for _, path, _ in _diff_raw(repo, 'HEAD', target)})
+        saved, backed_up = {}, []
+        backup_root = self._dated_quarantine_dir(repo)
+        for path in touched:
+            ours = (Path(repo.working_tree_dir) / path).read_bytes()
+            if path.lower().endswith(MERGEABLE_SUFFIXES):
+                base = (repo.head.commit.tree / path).data_stream.read()
+                saved[path] = (base.decode('utf-8', errors='surrogateescape'), ours.decode('utf-8', errors='surrogateescape'))
+            else:
+                self._backup_file(repo, path, ours, backup_root)
+                backed_up.append(path)
+        for batch in _chunks(touched, 200):
+            repo.git.checkout('HEAD', '--', *batch)
+        self._report_paths(f"can't merge these, your versions are backed up in {backup_root}", backed_up, "orange")
+        return saved
+
+    def restore_local_settings(self, repo, saved, merge=True):
+        """After the update: three-way merge each saved config onto its new upstream version.
+        With merge=False (update failed) the local text is just written back."""
+        backup_root = self._dated_quarantine_dir(repo)
+        for path, (base, ours) in saved.items():
+            full = Path(repo.working_tree_dir) / path
+            if not merge:
+                full.write_bytes(ours.encode('utf-8', errors='surrogateescape'))
+                continue
+            if not full.exists():
+                self._backup_file(repo, path, ours.encode('utf-8', errors='surrogateescape'), backup_root)
+                self.ui_callback(f"{path} was removed from the pack, your copy is in {backup_root}", "orange")
+                continue
+            theirs = full.read_bytes().decode('utf-8', errors='surrogateescape')
+            merged, conflicts, dropped = _merge_kv(base, ours, theirs, _kv_separator(path))
+            full.write_bytes(merged.encode('utf-8', errors='surrogateescape'))
+            self.ui_callback(f"merged your settings into {path}", "lime")
+            if conflicts:
+                self.ui_callback(f"  kept your value over the update for: {', '.join(conflicts)}", "orange")
+            if dropped:
+                self.ui_callback(f"  no longer in the pack, dropped: {', '.join(dropped)}", "orange")
+
+    def quarantine_untracked_jars(self, repo):
+        """Move jars in mods/ that aren't part of the pack into a dated quarantine folder.
+        Returns (list of moved paths, quarantine folder)."""
+        out = repo.git.ls_files('-z', '--others', '--', 'mods/')  # ignored files included on purpose
+        jars = [p for p in out.split('\0') if p.lower().endswith('.jar')]
+        dest_root = self._dated_quarantine_dir(repo)
+        for path in jars:
+            dest = dest_root / path
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(Path(repo.working_tree_dir) / path), str(dest))
+        return jars, dest_root
+
+    def _report_paths(self, title, paths, color, limit=8):
+        if not paths:
+            return
+        self.ui_callback(f"{title} ({len(paths)}):", color)
+        for path in paths[:limit]:
+            self.ui_callback(f"  {path}", color)
+        if len(paths) > limit:
+            self.ui_callback(f"  ...and {len(paths) - limit} more", color)
 
     def update_modpack(self, repo_path, branch, mode='normal'):
-        """Fetch and pull updates. mode: 'normal', 'preserve', or 'clean'."""
-        def progress_callback(op_code, cur_count, max_count=None, message=""):
-            progress_message = format_progress(cur_count, max_count, message)
-            print(progress_message)
-            self.ui_callback(progress_message, "cyan")
+        """Fetch and pull updates. mode: 'normal', 'preserve', or 'repair'."""
+        progress_callback = GitProgress(self.print_status, self.ui_bar_callback, [('fetch', 0.8), ('apply', 0.2)])
 
         repo_path = Path(repo_path)
         exe_path = repo_path / LAUNCHER_EXE_NAME
-        pre_hash = _hash_file(exe_path) if (get_current_os() == OS_WIN and exe_path.exists()) else None
-        exe_old_path = exe_path.with_suffix('.exe.old') if exe_path else None
+        exe_old_path = exe_path.with_suffix('.exe.old')
 
         def rename_exe_out():
-            if pre_hash is not None and exe_path.exists():
+            # windows can rename the running exe but not replace it; only needed if the update changes it
+            if get_current_os() == OS_WIN and exe_path.exists():
+                _write_journal(repo, journal, exe_renamed=True)
                 if exe_old_path.exists():
                     exe_old_path.unlink()
                 exe_path.rename(exe_old_path)
@@ -609,37 +2977,90 @@ class GitBackend:
             exe_path.unlink(missing_ok=True)
             exe_old_path.rename(exe_path)
 
+        repo = journal = None
+        finished = False
         try:
             repo = git.Repo(repo_path)
-
-            if mode == 'clean':
-                if not messagebox.askokcancel('Clean Install',
-                        'This doesn\'t go full nuclear but should fix\n'
-                        'problems with big updates.\n\n'
+            # if the launcher dies part way, the next start finishes or undoes it (recover_interrupted).
+            # step stays 'fetch' until the player has confirmed everything and the tree is about to change
+            journal = {'op': 'update', 'started': datetime.datetime.now().isoformat(timespec='seconds'),
+                       'branch': branch, 'mode': mode, 'step': 'fetch', 'old_head': repo.head.commit.hexsha,
+                       'old_branch': None if repo.head.is_detached else repo.active_branch.name}
+            _write_journal(repo, journal)
+            self.discard_staged_update(repo)  # this update supersedes anything staged
+
+            # size it up before downloading anything, so a big update can be put off; if the
+            # remote tip or its tree listing isn't available, the preview comes after the fetch
+            previewed = False
+            try:
+                remote_target = self.ls_remote_head(repo, branch, timeout=MIRROR_PROBE_TIMEOUT_SECS)
+            except LookupError:
+                remote_target = None  # the fetch and checkout below report it
+            if remote_target is not None:
+                try:
+                    if not self.confirm_update_preview(repo, branch, remote_target):
+                        raise UserWarning("update postponed")
+                    previewed = True
+                except LookupError as e:
+                    print(f"couldn't size the update before downloading: {e}")
+            if _load_prefs(repo_path)['lan_share']:
+                self.fetch_from_lan_peers(repo, branch)
+            self.ui_callback("Fetching remote...", "yellow")
+            progress_callback.start('fetch')
+            self.fetch_origin(repo, progress=progress_callback, branch=branch)
+            self.drop_lan_fetch_ref(repo)
+            if not previewed and not self.confirm_update_preview(repo, branch):
+                raise UserWarning("update postponed")
+            old_head = repo.head.commit.hexsha
+            target = repo.remotes.origin.refs[branch].commit.hexsha
+            progress_callback.start('apply')
+
+            if mode == 'repair':
+                if not messagebox.askokcancel('Repair Install',
+                        'This puts every modpack file back the way it ships\n'
+                        '(your changes to pack files are reset) and moves\n'
+                        f'extra mod jars into {QUARANTINE_DIR_NAME}/.\n\n'
                         'Your saves, screenshots, resourcepacks, shaders, will NOT be affected.\n\nContinue?'):
-                    raise UserWarning("user cancelled clean install")
-                self.ui_callback("Fetching remote...", "yellow")
-                repo.remotes.origin.fetch(progress=progress_callback)
-                repo.git.checkout(branch)
-                renamed_exe = rename_exe_out()
+                    raise UserWarning("user cancelled repair")
+                _write_journal(repo, journal, step='apply', target=target)
+                t0 = time.time()
+                if repo.head.is_detached or repo.active_branch.name != branch:
+                    repo.git.checkout('-f', branch)
+                # index -> new tip, working tree untouched; then only differing paths get rewritten
+                repo.git.reset('-q', target)
+                components = self.get_components(repo)
+                stale = [path for status, path, _ in _diff_raw(repo, old_head, target)
+                         if status == 'D' and not _excluded_by_components(path, components)]
+                restore = [p for p in repo.git.diff('--name-only', '-z').split('\0') if p]
+                renamed_exe = False
+                if LAUNCHER_EXE_NAME in restore:
+                    renamed_exe = rename_exe_out()
+                    if renamed_exe:
+                        restore.remove(LAUNCHER_EXE_NAME)
                 try:
-                    for d in ['bin', 'libraries', 'versions', 'config']:
-                        if (repo_path / d).exists():
-                            self.ui_callback(f"Cleaning {d}/...", "orange")
-                            repo.git.clean('-fdx', d)
-                    repo.git.reset('--hard', f'origin/{branch}')
+                    for batch in _chunks(restore, 200):
+                        repo.git.checkout('--', *batch)
+                    for path in stale:
+                        (repo_path / path).unlink(missing_ok=True)
+                    jars, quarantine = self.quarantine_untracked_jars(repo)
                 except Exception as err:
                     if renamed_exe:
                         restore_exe()
                     raise err
+                self._report_paths("restored", restore + ([LAUNCHER_EXE_NAME] if renamed_exe else []), "cyan")
+                self._report_paths("removed files dropped from the pack", stale, "cyan")
+                self._report_paths(f"moved extra jars to {quarantine}", jars, "orange")
+                if not (restore or stale or jars or renamed_exe):
+                    self.ui_callback("Nothing to repair, install matches the pack.", "lime")
+                self.ui_callback(f"Repair took {time.time() - t0:.2f}s", "white")
 
             else:
-                stashed = False
+                saved_settings = None
                 if repo.is_dirty():
                     if mode == 'preserve':
-                        self.ui_callback("Stashing local settings...", "yellow")
-                        repo.git.stash('push', '-m', 'frontier_launcher_auto_stash')
-                        stashed = True
+                        self.ui_callback("Saving local settings...", "yellow")
+                        saved_settings = self.save_local_settings(repo, target)
+                        _write_journal(repo, journal, saved_settings=saved_settings)
                     else:
                         result = messagebox.askokcancel('Warning',
                             'You have modifications to tracked files that will be reset.\n'
@@ -651,43 +3072,104 @@ class GitBackend:
                             if tracking_branch:
                                 self.ui_callback(f"Tracking branch: {tracking_branch}", "green")
                                 repo.git.reset('--hard')
-                                repo.remotes.origin.fetch(progress=progress_callback)
-                repo.git.checkout(branch)
-                renamed_exe = rename_exe_out()
+                _write_journal(repo, journal, step='apply', target=target)
+                self.checkout_branch(repo, branch)
+                renamed_exe = bool(_diff_raw(repo, 'HEAD', target, LAUNCHER_EXE_NAME)) and rename_exe_out()
                 try:
-                    repo.remotes.origin.pull(progress=progress_callback)
+                    self.pull_branch(repo, branch, progress=progress_callback)
                 except Exception as pull_err:
                     if renamed_exe:
                         restore_exe()
+                    if saved_settings:
+                        self.restore_local_settings(repo, saved_settings, merge=False)
                     raise pull_err
-                if stashed:
+                if saved_settings:
                     self.ui_callback("Applying your settings...", "yellow")
-                    try:
-                        repo.git.stash('pop')
-                        self.ui_callback("Settings applied successfully.", "lime")
-                    except git.exc.GitCommandError:
-                        repo.git.reset('--hard')
-                        repo.git.stash('drop')
-                        self.ui_callback("oops, some files you'd changed were updated in the same place, and I can't merge them automatically. I'll have to reset, sorry", "orange")
+                    self.restore_local_settings(repo, saved_settings)
 
+            finished = True
+            progress_callback.done()
             self.ui_callback(f"Update on {branch} successful", 'lime')
             self.print_status_update(repo_path)
-
-            if pre_hash is not None and exe_path.exists():
-                post_hash = _hash_file(exe_path)
-                if pre_hash != post_hash:
-                    self.ui_callback("Launcher executable was updated!", "yellow")
-                    if messagebox.askyesno("Launcher Updated", "The Frontier Launcher itself was updated.\nRestart now to run the new version?"):
-                        env = os.environ.copy()
-                        for key in ('TCL_LIBRARY', 'TK_LIBRARY', 'TCLLIBPATH', 'TCL_ZIPFS_ROOT', 'TK_ZIPFS_ROOT'):
-                            env.pop(key, None)
-                        subprocess.Popen([str(exe_path)], env=env)
-                        self.quit_cb()
+            self.hooks.run(repo, old_head, repo.head.commit.hexsha)
 
         except UserWarning as w:
             self.ui_callback(f'Update cancelled: {w}', 'orange')
         except Exception as e:
             self.ui_callback(f"Update failed: {e}", "red")
+        finally:
+            if repo is not None and journal is not None:
+                if not finished and journal['step'] == 'apply':
+                    # the tree may be half way: put it in a known state now, same as the next start would
+                    try:
+                        self._recover_update(repo, journal)
+                        _clear_journal(repo)
+                    except Exception as e:
+                        self.ui_callback(f"Couldn't undo the failed update ({e}), restart the launcher to try again.", "red")
+                else:
+                    _clear_journal(repo)
+
+    def recover_interrupted(self, path, startup=False):
+        """Finish or roll back an update/install the journal says was cut short by an earlier run
+        (launcher closed, crashed, or the PC went off part way). startup=False (a path confirmed
+        later): background git work may be running, so only locks from before this run are cleared."""
+        try:
+            repo = git.Repo(path)
+        except Exception:
+            return
+        journal = _read_journal(repo)
+        if not journal or journal.get('run') == _RUN_ID:
+            return  # nothing to do, or this run's own operation: it already cleaned up or said what to do
+        self.ui_callback(f"The {journal['op']} started {journal['started']} didn't finish, sorting it out...", "orange")
+        removed = _clear_stale_git_locks(repo, older_than=None if startup else _STARTED_AT)
+        if removed:
+            print(f"removed stale git files: {removed}")
+        try:
+            if journal['op'] == 'install':
+                if self.install_remote_at(path, journal['mode'], journal['components']):
+                    self.ui_callback("Install finished.", "lime")
+                return
+            if journal['op'] == 'branch switch':
+                self._recover_branch_switch(repo, journal['branch_switch'])
+                self.ui_callback("Branch switch sorted out.", "lime")
+            else:
+                self._recover_update(repo, journal)
+        except Exception as e:
+            self.ui_callback(f"Couldn't recover the interrupted {journal['op']}: {e}. Try Update with Repair.", "red")
+        _clear_journal(repo)
+
+    def _recover_update(self, repo, journal):
+        if journal.get('branch_switch'):
+            self._recover_branch_switch(repo, journal['branch_switch'])
+        exe_path = Path(repo.working_tree_dir) / LAUNCHER_EXE_NAME
+        exe_old_path = exe_path.with_suffix('.exe.old')
+        if journal.get('exe_renamed') and exe_old_path.exists() and not exe_path.exists():
+            exe_old_path.rename(exe_path)
+        target, branch, old_head = journal.get('target'), journal['branch'], journal['old_head']
+        saved = journal.get('saved_settings')
+        if journal['step'] == 'fetch':
+            self.ui_callback("It stopped while downloading, nothing in your install changed. Press Update to try again.", "yellow")
+            return
+        on_branch = not repo.head.is_detached and repo.active_branch.name == branch
+        if on_branch and repo.head.commit.hexsha == target:
+            self.ui_callback(f"The update to {target[:7]} went through, finishing up...", "yellow")
+            if saved:
+                self.restore_local_settings(repo, saved)
+        elif journal['mode'] == 'repair':
+            self.ui_callback(f"Finishing the repair at {target[:7]}...", "yellow")
+            if not on_branch:
+                repo.git.checkout('-f', branch)
+            repo.git.reset('--hard', target)
+        else:
+            self.ui_callback(f"Rolling back to {old_head[:7]}...", "yellow")
+            repo.git.checkout('-f', journal['old_branch'] or old_head)
+            repo.git.reset('--hard', old_head)
+            if saved:
+                self.restore_local_settings(repo, saved, merge=False)
+            self.ui_callback("Rolled back, your install is as it was before the update. Press Update to try again.", "lime")
+            return
+        self.hooks.run(repo, old_head, target)
+        self.ui_callback(f"Update on {branch} finished.", "lime")
 
     def run_git_command(self, repo, command):
         """Run a Git command and stream output to the console."""
@@ -700,7 +3182,7 @@ class GitBackend:
         except Exception as e:
             self.print_status(f"Error running command '{command}': {e}", "red")
 
-    def check_and_prepare(self, path):
+    def check_and_prepare(self, path, mode=INSTALL_MODE_QUICK, components=None):
         """Check the directory and prepare it for use."""
         self.print_status(f"Checking path: {path}", "white")
         if os.path.exists('{path}'):
@@ -715,8 +3197,275 @@ class GitBackend:
                 self.print_status("Non-Git directory detected.", "yellow")
         else:
             self.print_status(f"installing {path}", "yellow")
-            self.install_repo(path)
+            self.install_repo(path, mode, components)
           
+class DulwichBackend(GitBackend):
+    """Used when there's no git executable (GIT_FALLBACK): install, update, branch list and status
+    in pure python through dulwich, so a first install doesn't have to wait for the Git installer.
+    What it writes is a normal git repo, so installing Git later just turns everything else on.
+    Features that need Git (verify, instances, rollback, seeds, maintenance, LAN sharing, staged
+    updates, preserve/repair updates, components) say so instead."""
+
+    def _open(self, path):
+        return git.Repo(path, odbt=git.GitDB)  # GitPython's default object db shells out to git
+
+    def _needs_git(self, what):
+        self.ui_callback(f"{what} needs Git installed (https://git-scm.com). Install it and restart the launcher.", "orange")
+
+    def check_repo(self, path):
+        return self._open(path) if super().check_repo(path) else None
+
+    def fetch_origin(self, repo, progress=None, branch=None):
+        from dulwich import porcelain
+        path = repo.working_tree_dir
+        depth = SHALLOW_DEPTH if _is_shallow(repo) else None
+        porcelain.fetch(path, 'origin', depth=depth, errstream=_ProgressWriter(git.remote.to_progress_instance(progress)))
+        self.remote.record(self._open(path))
+
+    def ls_remote_head(self, repo, branch, timeout=BLIND_LAUNCH_TIMEOUT_SECS):
+        from dulwich import porcelain
+        url, result = repo.remotes.origin.url, {}
+        def _run():
+            try:
+                result['refs'] = porcelain.ls_remote(url).refs
+            except Exception as e:
+                result['error'] = e
+        # there's no process to kill here; past the deadline the thread is just left to finish on its own
+        worker = threading.Thread(target=_run, daemon=True)
+        worker.start()
+        worker.join(timeout)
+        if 'refs' not in result:
+            print(f"ls-remote failed or timed out: {result.get('error', f'no answer within {timeout}s')}")
+            return None
+        sha = result['refs'].get(f'refs/heads/{branch}'.encode())
+        if sha is None:
+            raise LookupError(f"branch '{branch}' is not on the remote")
+        return sha.decode()
+
+    def mark_launch(self, path):
+        from dulwich.repo import Repo
+        try:
+            sha = self._open(path).head.commit.hexsha
+            with Repo(str(path)) as r:
+                config = r.get_config()
+                section, name = PENDING_LAUNCH_KEY.rsplit('.', 1)
+                config.set((section.encode(),), name.encode(), f"{sha} {int(time.time())}".encode())
+                config.write_to_path()
+        except Exception as e:
+            print(f"couldn't record launch: {e}")
+
+    def take_pending_launch(self, repo):
+        from dulwich.repo import Repo
+        section, name = PENDING_LAUNCH_KEY.rsplit('.', 1)
+        with Repo(repo.working_tree_dir) as r:
+            config = r.get_config()
+            try:
+                pending = config.get((section.encode(),), name.encode()).decode()
+            except KeyError:
+                return None
+            del config[(section.encode(),)][name.encode()]
+            config.write_to_path()
+        sha, launched_at = pending.split()
+        return sha, int(launched_at)
+
+    def mark_known_good(self, repo, sha):
+        from dulwich.repo import Repo
+        with Repo(repo.working_tree_dir) as r:
+            r.refs[LAST_KNOWN_GOOD_REF.encode()] = sha.encode()
+
+    def last_known_good(self, repo):
+        from dulwich.repo import Repo
+        with Repo(repo.working_tree_dir) as r:
+            sha = r.refs.as_dict().get(LAST_KNOWN_GOOD_REF.encode())
+        return sha.decode() if sha else None
+
+    def _tree_files(self, path, commit):
+        """{path: blob id} for every file in `commit` (empty for None)."""
+        from dulwich.repo import Repo
+        if commit is None:
+            return {}
+        with Repo(str(path)) as r:
+            tree = r[commit.encode()].tree
+            return {entry.path.decode('utf-8', errors='surrogateescape'): entry.sha
+                    for entry in r.object_store.iter_tree_contents(tree)}
+
+    def _untracked_in_the_way(self, path, old_files, new_files):
+        """Files the checkout would create that already exist on disk but aren't tracked now
+        (git refuses to overwrite these; dulwich would do it silently)."""
+        return sorted(p for p in new_files.keys() - old_files.keys() if os.path.lexists(Path(path) / p))
+
+    def _checkout(self, path, branch, target):
+        """Put `branch` (tracking origin) at `target` and make the working tree match: a checkout
+        plus a fast-forward, done as HEAD -> branch then reset --hard."""
+        from dulwich import porcelain
+        from dulwich.repo import Repo
+        ref = f'refs/heads/{branch}'.encode()
+        with Repo(str(path)) as r:
+            if ref not in r.refs:
+                r.refs[ref] = target.encode()
+            r.refs.set_symbolic_ref(b'HEAD', ref)
+            config = r.get_config()
+            config.set((b'branch', branch.encode()), b'remote', b'origin')
+            config.set((b'branch', branch.encode()), b'merge', ref)
+            config.write_to_path()
+            porcelain.reset(r, 'hard', target.encode())
+
+    def install_remote_at(self, path, mode=INSTALL_MODE_QUICK, components=None):
+        """Same contract as GitBackend.install_remote_at (journaled, can run twice, False if the
+        player backs out of overwriting files), through dulwich. Seeds and components need Git."""
+        from dulwich import porcelain
+        from dulwich.repo import Repo
+        if components is not None and set(components) != set(COMPONENT_PATTERNS):
+            self.ui_callback("Leaving out components needs Git installed, installing all of them", "orange")
+        progress = GitProgress(self.print_status, self.ui_bar_callback, [('fetch', 0.85), ('checkout', 0.15)])
+        self.ui_callback(f"init'ing git repo at {path}", color='yellow')
+        if not (Path(path) / '.git').exists():
+            porcelain.init(str(path)).close()
+        repo = self._open(path)
+        journal = {'op': 'install', 'started': datetime.datetime.now().isoformat(timespec='seconds'),
+                   'mode': mode, 'components': components, 'step': 'fetch'}
+        _write_journal(repo, journal)
+        with Repo(str(path)) as r:
+            config = r.get_config()
+            if not config.has_section((b'remote', b'origin')):
+                self.ui_callback(f"adding remote url {REPO_URL}", color='yellow')
+                config.set((b'remote', b'origin'), b'url', REPO_URL.encode())
+                config.set((b'remote', b'origin'), b'fetch', b'+refs/heads/*:refs/remotes/origin/*')
+                config.write_to_path()
+        self.ui_callback(f"fetching remote on network...", color='yellow')
+        progress.start('fetch')
+        porcelain.fetch(str(path), 'origin', depth=SHALLOW_DEPTH if mode == INSTALL_MODE_QUICK else None,
+                        errstream=_ProgressWriter(progress))
+        repo = self._open(path)
+        self.remote.record(repo)
+        _write_journal(repo, journal, step='checkout')
+        self.ui_callback(f"done. installing..")
+        target = repo.remotes.origin.refs[MAIN_BRANCH_NAME].commit.hexsha
+        in_the_way = self._untracked_in_the_way(path, {}, self._tree_files(path, target))
+        if in_the_way and not messagebox.askokcancel("WARNING: Overwrite files",
+                "you already have an install I don't know about and the files listed below would be overwritten by installing this modpack. "
+                f"Continue if you are ok with this, or cancel and back up / move your old files.\n\n" + '\n'.join(in_the_way[:20])):
+            _clear_journal(repo)
+            return False
+        progress.start('checkout')
+        self._checkout(path, MAIN_BRANCH_NAME, target)
+        progress.done()
+        _clear_journal(repo)
+        return True
+
+    def install_repo(self, path, mode=INSTALL_MODE_QUICK, components=None):
+        self.print_status(f"Installing into {path} without Git ({mode} install)...", "yellow")
+        try:
+            Path(path).mkdir(parents=True, exist_ok=True)
+            if self.install_remote_at(path, mode, components):
+                self.print_status("Install successful!", 'lime')
+            else:
+                self.print_status("install cancelled", "orange")
+        except Exception as e:
+            self.print_status(f"Install failed: {e}. Restart the launcher to pick up where it stopped.", "red")
+
+    def update_modpack(self, repo_path, branch, mode='normal'):
+        from dulwich import porcelain
+        progress = GitProgress(self.print_status, self.ui_bar_callback, [('fetch', 0.8), ('apply', 0.2)])
+        repo_path = Path(repo_path)
+        try:
+            if mode != 'normal':
+                self.ui_callback(f"'{mode}' updates need Git installed, doing a normal update", "orange")
+            self.ui_callback("Fetching remote...", "yellow")
+            progress.start('fetch')
+            repo = self._open(repo_path)
+            self.fetch_origin(repo, progress=progress, branch=branch)
+            target = repo.remotes.origin.refs[branch].commit.hexsha
+            old_head = repo.head.commit.hexsha
+            if not repo.head.is_detached and repo.active_branch.name == branch and old_head == target:
+                self.ui_callback(f"Already up to date with '{branch}'", "lime")
+                return
+            status = porcelain.status(str(repo_path), untracked_files='no')
+            if (status.unstaged or any(status.staged.values())) and not messagebox.askokcancel('Warning',
+                    'You have modifications to tracked files that will be reset.\n'
+                    '(Keeping them across an update needs Git installed.)'):
+                raise UserWarning("user cancelled to check modifications")
+            old_files, new_files = self._tree_files(repo_path, old_head), self._tree_files(repo_path, target)
+            in_the_way = self._untracked_in_the_way(repo_path, old_files, new_files)
+            if in_the_way and not messagebox.askokcancel('Warning',
+                    'These files of yours would be replaced by the update:\n\n' + '\n'.join(in_the_way[:20])):
+                raise UserWarning("user cancelled to keep their files")
+            progress.start('apply')
+            exe_path = repo_path / LAUNCHER_EXE_NAME
+            if get_current_os() == OS_WIN and exe_path.exists() and old_files.get(LAUNCHER_EXE_NAME) != new_files.get(LAUNCHER_EXE_NAME):
+                # windows can rename the running exe but not replace it; bootup_seq cleans up the .old
+                exe_old_path = exe_path.with_suffix('.exe.old')
+                exe_old_path.unlink(missing_ok=True)
+                exe_path.rename(exe_old_path)
+            self._checkout(repo_path, branch, target)
+            progress.done()
+            self.ui_callback(f"Update on {branch} successful", 'lime')
+            self.print_status_update(repo_path)
+        except UserWarning as w:
+            self.ui_callback(f'Update cancelled: {w}', 'orange')
+        except Exception as e:
+            self.ui_callback(f"Update failed: {e}", "red")
+
+    def print_status_update(self, path, v=True):
+        from dulwich import porcelain
+        from dulwich.repo import Repo
+        try:
+            repo = self._open(path)
+            branch = repo.active_branch.name
+            commit = repo.head.commit
+            commit_date = datetime.datetime.fromtimestamp(commit.committed_date).strftime("%m-%d-%Y %H:%M")
+            status = porcelain.status(str(path), untracked_files='no')
+            changes = [('M', p) for p in status.unstaged]
+            for kind, code in (('add', 'A'), ('delete', 'D'), ('modify', 'M')):
+                changes += [(code, p) for p in status.staged[kind]]
+            self.ui_callback(f">> status: on branch '{branch}'\n>> commit: {commit.hexsha[:7]} ({'dirty' if changes else 'clean'}) \"{commit.message}\" <{commit_date}>", color="pink")
+            if v:
+                for code, p in changes:
+                    p = p.decode('utf-8', errors='replace') if isinstance(p, bytes) else p
+                    self.ui_callback(f'>> [{code}] {p}', {'M': 'cyan', 'A': 'lime', 'D': 'red'}[code])
+            self.ui_callback("Checking for new remote versions...", color="yellow")
+            remote_sha = self.remote.remote_head(path, branch)
+            if remote_sha is None:
+                self.ui_callback(f"Branch '{branch}' is not on the remote", color="orange")
+            elif commit.hexsha == remote_sha:
+                self.ui_callback(f"You are up-to-date with version '{branch}'", color='lime')
+            else:
+                try:
+                    with Repo(str(path)) as r:
+                        behind = str(len(list(r.get_walker(include=[remote_sha.encode()], exclude=[commit.hexsha.encode()]))))
+                except Exception:
+                    behind = '?'  # shallow history can end before the common commit
+                self.ui_callback(f"!! A newer version {remote_sha[:7]} is available on the remote branch '{branch}' ({behind} commit(s) behind)", color="orange")
+        except Exception as e:
+            self.ui_callback(f"Unexpected error: {e}", color="red")
+
+    def maintenance_due(self, repo):
+        return False
+
+    def run_maintenance(self, path, locked=False, force=False):
+        print("maintenance needs Git, skipped")  # runs on its own when idle, nothing to tell the player
+
+    def update_lan_sharing(self, path):
+        pass
+
+    def stage_update(self, repo_path, rate_limit_kbps=0):
+        print("staging updates needs Git, skipped")
+
+    def verify_install(self, path):
+        self._needs_git("Verify")
+
+    def create_instance(self, path, name, dest, branch):
+        self._needs_git("Instances")
+
+    def rollback_to_last_known_good(self, repo_path):
+        self._needs_git("Rollback")
+        return False
+
+    def create_seed_bundle(self, repo_path, dest):
+        self._needs_git("Making a seed")
+        return False
+
+
 class FrontEnd:
     def __init__(self, root):
         self.root = root
@@ -739,6 +3488,14 @@ class FrontEnd:
         self.version_label.pack(side=tk.LEFT, padx=(0, 6))
         self.bug_report_button = tk.Button(self._bottom_inner, text="problem...", font=("Arial", 8), bg="#c06060", fg="white", relief=tk.FLAT, padx=4, pady=2, command=None)
         self.bug_report_button.pack(side=tk.LEFT)
+        self.settings_button = tk.Button(self._bottom_inner, text="settings...", font=("Arial", 8), relief=tk.FLAT, padx=4, pady=2, command=None)
+        self.settings_button.pack(side=tk.LEFT, padx=(6, 0))
+        self.rollback_button = tk.Button(self._bottom_inner, text="rollback", font=("Arial", 8), relief=tk.FLAT, padx=4, pady=2, command=None)
+        self.rollback_button.pack(side=tk.LEFT, padx=(6, 0))
+        self.seed_button = tk.Button(self._bottom_inner, text="make seed...", font=("Arial", 8), relief=tk.FLAT, padx=4, pady=2, command=None)
+        self.seed_button.pack(side=tk.LEFT, padx=(6, 0))
+        self.cancel_button = tk.Button(self._bottom_inner, text="cancel download", font=("Arial", 8), relief=tk.FLAT, padx=4, pady=2, command=None)
+        self.cancel_button.pack(side=tk.LEFT, padx=(6, 0))
 
         # --- State Display Section ---
         self.setup_state_display(root)
@@ -779,6 +3536,8 @@ class FrontEnd:
         self.cfglist.append(self.controls_frame)
         self.cfglist.append(self.branch_label)
         self.cfglist.append(self.update_row)
+        self.cfglist.append(self.install_row)
+        self.cfglist.append(self.status_row)
         # server_status_frame intentionally not in cfglist — its bg tracks server status, not app state
 
         self.cfglist.append(self.bottom_bar)
@@ -884,41 +3643,11 @@ class FrontEnd:
         self.update_ui_for_state()
     
     def update_progress_bar(self, current, max_value):
-        """Update the progress bar based on current progress."""
+        """Update the progress bar based on current progress. Safe from any thread: the latest
+        value is drawn on the next console frame."""
         if max_value is None or max_value == 0:
             max_value = 1  # Avoid division by zero
-        progress_ratio = min(max(current / max_value, 0), 1)  # Clamp ratio between 0 and 1
-        bar_width = int(self.progress_max_width * progress_ratio)
-
-        # Update the bar's width
-        self.progress_canvas.coords(self.progress_bar, 0, 0, bar_width, 10)
-
-    def simulate_progress_bar(self, duration):
-        max_value = 100  # Simulate progress as 0 to 100%
-        current = 0      # Starting point
-        start_time = time.time()
-        end_time = start_time + duration
-
-        while current < max_value:
-            # Calculate elapsed time and progress
-            elapsed_time = time.time() - start_time
-            progress_ratio = elapsed_time / duration
-            next_value = int(progress_ratio * max_value)
-
-            # Jitter to make progress seem less linear
-            jitter = random.randint(-1, 2)  # Small random fluctuations
-            next_value = max(0, min(max_value, next_value + jitter))
-
-            # If progress increases, update it
-            if next_value > current:
-                current = next_value
-                self.update_progress_bar(current, max_value)
-
-            # Sleep briefly to control update frequency
-            time.sleep(0.05)
-
-        # Ensure the progress bar reaches 100% at the end
-        self.update_progress_bar(max_value, max_value)
+        self._bar_pending = min(max(current / max_value, 0), 1)  # Clamp ratio between 0 and 1
 
     def update_ui_for_state(self):
         """Update UI elements based on the current state."""
@@ -928,6 +3657,10 @@ class FrontEnd:
             self.enable_update(False)
             self.enable_opendir(True)
             self.enable_status(False)
+            self.enable_verify(False)
+            self.enable_instances(False)
+            self.enable_seed(False)
+            self.enable_rollback(False)
             cache_file = Path(self.path_var.get()) / ".mc_launcher_path.cache"
             can_blind_launch = False
             if cache_file.exists():
@@ -940,6 +3673,10 @@ class FrontEnd:
             self.enable_install(True)
             self.enable_opendir(True)
             self.enable_status(False)
+            self.enable_verify(False)
+            self.enable_instances(False)
+            self.enable_seed(False)
+            self.enable_rollback(False)
             self.enable_launch(False)
         elif self.current_state == STATE_CONNECTED:
             self.enable_path_editing(False)
@@ -947,6 +3684,10 @@ class FrontEnd:
             self.enable_update(True)
             self.enable_opendir(True)
             self.enable_status(True)
+            self.enable_verify(True)
+            self.enable_instances(True)
+            self.enable_seed(True)
+            self.enable_rollback(True)
             self.enable_launch(True)
 
     def enable_path_editing(self, enable):
@@ -966,6 +3707,7 @@ class FrontEnd:
         """Enable or disable the install and update buttons."""
         state = tk.NORMAL if enable else tk.DISABLED
         self.install_button.config(state=state)
+        self.install_mode_menu.config(state=state)
 
     def enable_opendir(self, enable):
         """Enable or disable the install and update buttons."""
@@ -977,6 +3719,26 @@ class FrontEnd:
         state = tk.NORMAL if enable else tk.DISABLED
         self.status_button.config(state=state)
 
+    def enable_rollback(self, enable):
+        """Rollback works on a connected install only."""
+        state = tk.NORMAL if enable else tk.DISABLED
+        self.rollback_button.config(state=state)
+
+    def enable_seed(self, enable):
+        """Seeds are made from a connected install only."""
+        state = tk.NORMAL if enable else tk.DISABLED
+        self.seed_button.config(state=state)
+
+    def enable_instances(self, enable):
+        """Instances are listed and made from a connected install only."""
+        state = tk.NORMAL if enable else tk.DISABLED
+        self.instances_button.config(state=state)
+
+    def enable_verify(self, enable):
+        """Verify checks a connected install only."""
+        state = tk.NORMAL if enable else tk.DISABLED
+        self.verify_button.config(state=state)
+
     def enable_launch(self, enable):
         """Enable or disable the install and update buttons."""
         state = tk.NORMAL if enable else tk.DISABLED
@@ -1023,6 +3785,9 @@ class FrontEnd:
         self.confirm_button = tk.Button(self.path_buttons_frame, text="Confirm Path", command=None, height=BUTTON_HEIGHT, width=BUTTON_WIDTH, bg="lightblue", fg="black")
         self.confirm_button.pack(side=tk.LEFT, padx=5)
 
+        self.instances_button = tk.Button(self.path_buttons_frame, text="Instances", command=None, height=BUTTON_HEIGHT, width=BUTTON_WIDTH)
+        self.instances_button.pack(side=tk.LEFT, padx=5)
+
     def setup_controls(self):
         """Set up the controls section with buttons and dropdowns."""
         self.controls_frame = tk.Frame(self.root, bg=BG_COLOR)
@@ -1044,7 +3809,7 @@ class FrontEnd:
         self.open_dir_button = tk.Button(self.controls_frame, text="Open Minecraft Dir", command=None, height=BUTTON_HEIGHT, width=BUTTON_WIDTH, bg='lightgreen')
         self.open_dir_button.grid(row=1, column=1, padx=10, pady=5)
 
-    def setup_callbacks(self, browse_cb, confirm_cb, update_cb, install_cb, open_cb, status_cb, launch_cb, bug_report_cb, refresh_server_cb=None):
+    def setup_callbacks(self, browse_cb, confirm_cb, update_cb, install_cb, open_cb, status_cb, launch_cb, bug_report_cb, refresh_server_cb=None, settings_cb=None, rollback_cb=None, seed_cb=None, instances_cb=None, verify_cb=None, cancel_cb=None):
         self.browse_button.config(command=browse_cb)
         self.confirm_button.config(command=confirm_cb)
         self.update_button.config(command=update_cb)
@@ -1053,6 +3818,12 @@ class FrontEnd:
         self.status_button.config(command=status_cb)
         self.launch_button.config(command=launch_cb)
         self.bug_report_button.config(command=bug_report_cb)
+        self.settings_button.config(command=settings_cb)
+        self.rollback_button.config(command=rollback_cb)
+        self.seed_button.config(command=seed_cb)
+        self.instances_button.config(command=instances_cb)
+        self.verify_button.config(command=verify_cb)
+        self.cancel_button.config(command=cancel_cb)
         self.refresh_cb = refresh_server_cb
 
     def setup_console(self, root, height=300, bg=CONSOLE_BG, fg=CONSOLE_FG, font=FONT_CONSOLE):
@@ -1062,15 +3833,45 @@ class FrontEnd:
 
         self.console_text = tk.Text(console_frame, bg=bg, fg=fg, wrap='word', font=font, height=height // 20)
         self.console_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # worker threads only ever touch the queue; _drain_console moves it into the widget
+        self._console_queue = queue.SimpleQueue()
+        self._console_tags = {}  # (color, font) -> tag name; names can't have spaces, Tk reads those as a tag list
+        self._bar_pending = None
+        root.after(CONSOLE_FRAME_MS, self._drain_console)
 
     def console_print(self, message, color=CONSOLE_FG, font=FONT_CONSOLE):
-        """Print a message to the console in the given color and font."""
+        """Print a message to the console in the given color and font. Safe from any thread, never
+        waits on Tk: the line shows up on the next frame."""
         print(f'CONSOLE: {message}')
-        self.console_text.config(state=tk.NORMAL)
-        self.console_text.tag_config(color, foreground=color, font=font)
-        self.console_text.insert(tk.END, message + "\n", color)
-        self.console_text.see(tk.END)
-        self.console_text.config(state=tk.DISABLED)
+        self._console_queue.put((message, color, font))
+
+    def _drain_console(self):
+        batch = []
+        try:
+            while True:
+                batch.append(self._console_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            batch = batch[-CONSOLE_MAX_LINES:]  # a flood larger than the buffer: only the tail would survive anyway
+            chunks = []
+            for message, color, font in batch:
+                tag = self._console_tags.get((color, font))
+                if tag is None:
+                    tag = self._console_tags[(color, font)] = f"c{len(self._console_tags)}"
+                    self.console_text.tag_config(tag, foreground=color, font=font)
+                chunks += [message + "\n", tag]
+            self.console_text.config(state=tk.NORMAL)
+            self.console_text.insert(tk.END, *chunks)  # one Tk call for the whole batch
+            lines = int(self.console_text.index('end-1c').split('.')[0])
+            if lines > CONSOLE_MAX_LINES:
+                self.console_text.delete('1.0', f'{lines - CONSOLE_MAX_LINES}.0')
+            self.console_text.see(tk.END)
+            self.console_text.config(state=tk.DISABLED)
+        if self._bar_pending is not None:
+            self.progress_canvas.coords(self.progress_bar, 0, 0, int(self.progress_max_width * self._bar_pending), 10)
+            self._bar_pending = None
+        self.root.after(CONSOLE_FRAME_MS, self._drain_console)
 
     def setup_image(self, root, image_url, width=200, height=200, bg=BG_COLOR):
         """Set up an image section."""
@@ -1122,13 +3923,13 @@ class FrontEnd:
         self.branch_dropdown.pack(pady=5)
 
         # Buttons (Stacked)
-        _MODE_COLORS = {'normal': 'lightblue', 'preserve': CONNECTED_BG_COLOR, 'clean': '#ffaa55'}
+        _MODE_COLORS = {'normal': 'lightblue', 'preserve': CONNECTED_BG_COLOR, 'repair': '#ffaa55'}
         self.update_row = tk.Frame(self.controls_frame, bg=BG_COLOR)
         self.update_row.pack(pady=5)
         self.update_button = tk.Button(self.update_row, text="Update", command=None, height=BUTTON_HEIGHT, width=12, bg='lightblue')
         self.update_button.pack(side=tk.LEFT)
         self.update_mode_var = tk.StringVar(value='normal')
-        self.mode_menu = tk.OptionMenu(self.update_row, self.update_mode_var, 'normal', 'preserve', 'clean')
+        self.mode_menu = tk.OptionMenu(self.update_row, self.update_mode_var, 'normal', 'preserve', 'repair')
         self.mode_menu.config(height=BUTTON_HEIGHT, width=6, bg='lightblue', activebackground='lightblue')
         self.mode_menu.pack(side=tk.LEFT)
         def _sync_mode_color(*_):
@@ -1136,16 +3937,142 @@ class FrontEnd:
             self.mode_menu.config(bg=c, activebackground=c)
         self.update_mode_var.trace_add('write', _sync_mode_color)
 
-        self.install_button = tk.Button(self.controls_frame, text="Install", command=None, height=BUTTON_HEIGHT, width=BUTTON_WIDTH)
-        self.install_button.pack(pady=5)
-
-        self.status_button = tk.Button(self.controls_frame, text="Status", command=None, height=BUTTON_HEIGHT, width=BUTTON_WIDTH)
-        self.status_button.pack(pady=5)
+        self.install_row = tk.Frame(self.controls_frame, bg=BG_COLOR)
+        self.install_row.pack(pady=5)
+        self.install_button = tk.Button(self.install_row, text="Install", command=None, height=BUTTON_HEIGHT, width=12)
+        self.install_button.pack(side=tk.LEFT)
+        self.install_mode_var = tk.StringVar(value=INSTALL_MODE_QUICK)
+        self.install_mode_menu = tk.OptionMenu(self.install_row, self.install_mode_var, INSTALL_MODE_QUICK, INSTALL_MODE_FULL)
+        self.install_mode_menu.config(height=BUTTON_HEIGHT, width=6)
+        self.install_mode_menu.pack(side=tk.LEFT)
+
+        self.status_row = tk.Frame(self.controls_frame, bg=BG_COLOR)
+        self.status_row.pack(pady=5)
+        self.status_button = tk.Button(self.status_row, text="Status", command=None, height=BUTTON_HEIGHT, width=12)
+        self.status_button.pack(side=tk.LEFT)
+        self.verify_button = tk.Button(self.status_row, text="Verify", command=None, height=BUTTON_HEIGHT, width=6)
+        self.verify_button.pack(side=tk.LEFT)
 
         self.open_dir_button = tk.Button(self.controls_frame, text="Open Minecraft Dir", command=None, height=BUTTON_HEIGHT, width=BUTTON_WIDTH, bg='lightgreen')
         self.open_dir_button.pack(pady=5)
 
 
+    def open_settings_dialog(self, prefs, on_save):
+        """Editor for the SETTINGS_FIELDS prefs. on_save(new_prefs) is called on Save."""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("settings")
+        dialog.configure(bg=BG_COLOR)
+        dialog.resizable(False, False)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Launcher Settings", font=FONT_TITLE, bg=BG_COLOR).pack(pady=(12, 8))
+        field_vars = {}
+        for key, label, kind in SETTINGS_FIELDS:
+            row = tk.Frame(dialog, bg=BG_COLOR)
+            row.pack(padx=16, fill=tk.X, pady=2)
+            if kind is bool:
+                field_vars[key] = tk.BooleanVar(value=bool(prefs.get(key)))
+                tk.Checkbutton(row, text=label, variable=field_vars[key], bg=BG_COLOR, anchor='w').pack(side=tk.LEFT)
+            else:
+                field_vars[key] = tk.StringVar(value=str(prefs.get(key, '')))
+                tk.Label(row, text=label, font=("Arial", 9), bg=BG_COLOR).pack(side=tk.LEFT)
+                tk.Entry(row, textvariable=field_vars[key], width=10 if kind is int else 32).pack(side=tk.RIGHT)
+
+        def on_ok():
+            new_prefs = dict(prefs)
+            for key, _label, kind in SETTINGS_FIELDS:
+                try:
+                    new_prefs[key] = kind(field_vars[key].get())
+                except ValueError:
+                    messagebox.showerror("Settings", f"'{field_vars[key].get()}' isn't a valid value for: {_label}", parent=dialog)
+                    return
+            on_save(new_prefs)
+            dialog.destroy()
+
+        btn_frame = tk.Frame(dialog, bg=BG_COLOR)
+        btn_frame.pack(pady=12)
+        tk.Button(btn_frame, text="Save", font=FONT_TEXT, width=14, height=1, command=on_ok).pack(side=tk.LEFT, padx=8)
+        tk.Button(btn_frame, text="Cancel", font=FONT_TEXT, width=14, height=1, command=dialog.destroy).pack(side=tk.LEFT, padx=8)
+
+    def open_instances_dialog(self, instances, current, branches, on_switch, on_create):
+        """Instance list with switch / create. on_switch(path), on_create(name, dest, branch)."""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("instances")
+        dialog.configure(bg=BG_COLOR)
+        dialog.resizable(False, False)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Instances", font=FONT_TITLE, bg=BG_COLOR).pack(pady=(12, 8))
+        for name, path in instances:
+            row = tk.Frame(dialog, bg=BG_COLOR)
+            row.pack(padx=16, fill=tk.X, pady=2)
+            is_current = Path(path).resolve() == Path(current).resolve()
+            tk.Label(row, text=f"{name}{' (current)' if is_current else ''}", font=FONT_TEXT, bg=BG_COLOR, width=16, anchor='w').pack(side=tk.LEFT)
+            tk.Label(row, text=str(path), font=("Arial", 8), bg=BG_COLOR, fg="#555555").pack(side=tk.LEFT, padx=6)
+            tk.Button(row, text="switch", font=("Arial", 8), state=tk.DISABLED if is_current else tk.NORMAL,
+                      command=lambda p=path: (dialog.destroy(), on_switch(p))).pack(side=tk.RIGHT)
+
+        tk.Label(dialog, text="new instance", font=FONT_TEXT, bg=BG_COLOR).pack(pady=(12, 2))
+        form = tk.Frame(dialog, bg=BG_COLOR)
+        form.pack(padx=16)
+        name_var = tk.StringVar()
+        branch_var = tk.StringVar(value=branches[0] if branches else MAIN_BRANCH_NAME)
+        tk.Label(form, text="name:", font=("Arial", 9), bg=BG_COLOR).grid(row=0, column=0, sticky='e')
+        tk.Entry(form, textvariable=name_var, width=20).grid(row=0, column=1, sticky='w', padx=4)
+        tk.Label(form, text="branch:", font=("Arial", 9), bg=BG_COLOR).grid(row=1, column=0, sticky='e')
+        ttk.Combobox(form, textvariable=branch_var, values=branches, state="readonly", width=18).grid(row=1, column=1, sticky='w', padx=4)
+
+        def on_ok():
+            name = name_var.get().strip()
+            if not name or not all(c.isalnum() or c in '-_' for c in name):
+                messagebox.showerror("Instances", "Pick a name made of letters, numbers, - and _", parent=dialog)
+                return
+            dest = Path(current).resolve().parent / f"{Path(instances[0][1]).name}-{name}"
+            dialog.destroy()
+            on_create(name, dest, branch_var.get())
+
+        btn_frame = tk.Frame(dialog, bg=BG_COLOR)
+        btn_frame.pack(pady=12)
+        tk.Button(btn_frame, text="Create", font=FONT_TEXT, width=14, height=1, command=on_ok).pack(side=tk.LEFT, padx=8)
+        tk.Button(btn_frame, text="Close", font=FONT_TEXT, width=14, height=1, command=dialog.destroy).pack(side=tk.LEFT, padx=8)
+
+    def ask_components(self, selected):
+        """Install component picker. Called from a worker thread: shows the dialog on the
+        Tk thread and blocks until it closes. Returns the chosen optional components, or None if cancelled."""
+        done = threading.Event()
+        result = {'components': None}
+
+        def show():
+            dialog = tk.Toplevel(self.root)
+            dialog.title("install components")
+            dialog.configure(bg=BG_COLOR)
+            dialog.resizable(False, False)
+            dialog.grab_set()
+            dialog.bind('<Destroy>', lambda e: done.set() if e.widget is dialog else None)
+
+            tk.Label(dialog, text="Install Components", font=FONT_TITLE, bg=BG_COLOR).pack(pady=(12, 4))
+            tk.Label(dialog, text="leave out what you don't need to download less", font=("Arial", 9), bg=BG_COLOR, fg="#555555").pack(padx=16, pady=(0, 8))
+
+            core_var = tk.BooleanVar(value=True)
+            tk.Checkbutton(dialog, text=f"{COMPONENT_CORE}: {COMPONENT_DESCRIPTIONS[COMPONENT_CORE]}", variable=core_var, state=tk.DISABLED, bg=BG_COLOR, anchor='w').pack(padx=16, fill=tk.X)
+            comp_vars = {}
+            for comp in COMPONENT_PATTERNS:
+                comp_vars[comp] = tk.BooleanVar(value=comp in selected)
+                tk.Checkbutton(dialog, text=f"{comp}: {COMPONENT_DESCRIPTIONS[comp]}", variable=comp_vars[comp], bg=BG_COLOR, anchor='w').pack(padx=16, fill=tk.X)
+
+            def on_ok():
+                result['components'] = [c for c, v in comp_vars.items() if v.get()]
+                dialog.destroy()
+
+            btn_frame = tk.Frame(dialog, bg=BG_COLOR)
+            btn_frame.pack(pady=12)
+            tk.Button(btn_frame, text="Install", font=FONT_TEXT, width=14, height=1, command=on_ok).pack(side=tk.LEFT, padx=8)
+            tk.Button(btn_frame, text="Cancel", font=FONT_TEXT, width=14, height=1, command=dialog.destroy).pack(side=tk.LEFT, padx=8)
+
+        self.root.after(0, show)
+        done.wait()
+        return result['components']
+
     def load_image_from_url(self, label, url, width, height):
         """Load and display an image from a URL, resizing it to fit."""
         try:
@@ -1195,17 +4122,26 @@ class Controller:
             self.control_launch,
             self.control_bug_report,
             refresh_server_cb=self.poll_server_status,
+            settings_cb=self.control_settings,
+            rollback_cb=self.control_rollback,
+            seed_cb=self.control_create_seed,
+            instances_cb=self.control_instances,
+            verify_cb=self.control_verify,
+            cancel_cb=self.control_cancel,
         )
 
-        self.backend = GitBackend(self.frontend.console_print, self.frontend.update_progress_bar, self.frontend.root.quit)
+        backend_class = DulwichBackend if GIT_FALLBACK else GitBackend
+        self.backend = backend_class(self.frontend.console_print, self.frontend.update_progress_bar, self.frontend.root.quit)
         self.set_state(STATE_UNCONNECTED, False)
 
     def bootup_seq(self):
         self.frontend.console_print("Frontier - Forge Minecraft Server 2026")
-        self.frontend.simulate_progress_bar(0.1)
-        self.frontend.update_progress_bar(0,1)
+        self.frontend.update_progress_bar(0, 1)
         self.frontend.console_print("Welcome to the Frontier Client Modpack Installer/Updater")
-        time.sleep(0.1)
+        if GIT_FALLBACK:
+            self.frontend.console_print("Git isn't installed: install, update and status work, other tools need Git (https://git-scm.com)", "orange")
+        # before the .old cleanup below: an interrupted update may still need the renamed exe
+        self.backend.recover_interrupted(self.frontend.path_var.get(), startup=True)
         # Clean up leftover .old exe from a previous self-update rename
         if get_current_os() == OS_WIN:
             old_exe = Path(self.frontend.path_var.get()) / (LAUNCHER_EXE_NAME + '.old')
@@ -1214,6 +4150,7 @@ class Controller:
                     old_exe.unlink()
                 except Exception:
                     pass  # not critical
+        self.frontend.update_progress_bar(1, 1)
         self.frontend.console_print("Confirm your .minecraft path above to get started")
 
     def poll_server_status(self):
@@ -1253,16 +4190,19 @@ class Controller:
         threading.Thread(target=_run, daemon=True).start()
 
     def run_app(self):
-        self.backend.run_in_thread(self.bootup_seq)
+        self.backend.run_in_thread(self.bootup_seq, name='startup')
         self.frontend.root.after(500, self.poll_server_status)
         self.frontend.root.mainloop()
+        self.backend.lan.stop()
 
     def set_state(self, state, log=True):
         self.__state = state
         self.frontend.set_state(self.get_state(), log)
         if (self.__state == STATE_CONNECTED):
+            self.frontend.root.after(0, self._schedule_maintenance)
             self.update_dropdown()
             self.backend.print_status_update(self.frontend.path_var.get())
+            self.backend.update_lan_sharing(self.frontend.path_var.get())
 
     def get_state(self):
         return self.__state
@@ -1280,27 +4220,39 @@ class Controller:
         if branches:
             self.frontend.branch_var.set(branches[0])  # Default to first branch
 
-    def install_modpack_internal(self, path):
-        self.backend.check_and_prepare(path)
+    def install_modpack_internal(self, path, mode=INSTALL_MODE_QUICK):
+        components = self.frontend.ask_components(_default_components())
+        if components is None:
+            self.frontend.console_print('install cancelled', color='orange')
+            return
+        self.backend.check_and_prepare(path, mode, components)
         self.control_confirm_internal()
 
     def control_confirm_internal(self):
         """Confirm the Minecraft folder path and determine the application state."""
         path = Path(self.frontend.path_var.get())
         if os.path.exists(f'{path.__str__()}'):
+            # bootup_seq only looks at the default folder; installs elsewhere get recovered when confirmed
+            self.backend.recover_interrupted(path)
             self.frontend.console_print('verifying tracked install...', color='yellow')
-            self.frontend.simulate_progress_bar(0.15)
+            self.frontend.update_progress_bar(0, 1)
             repo = self.backend.check_repo(path)
+            self.frontend.update_progress_bar(1, 1)
             if repo:
                 self.update_dropdown()
                 self.set_state(STATE_CONNECTED)
+                self._settle_last_launch(repo, path)
                 self._check_for_recent_crashes(path)
             else:
                 response = messagebox.askokcancel(title="Warning", message="You have an existing minecraft folder here not installed by this installer. I can install on top of this, but I may need to overwrite files. This installer does NOT track your saves or main options, but some other things. You will be warned again before any overwrites happen.\nPress ok to continue")
                 if not response:
                     self.set_state(STATE_UNCONNECTED)
                 else: #TODO error checkin?
-                    if not self.backend.install_remote_at(path):
+                    components = self.frontend.ask_components(_default_components())
+                    if components is None:
+                        self.set_state(STATE_UNCONNECTED)
+                        return
+                    if not self.backend.install_remote_at(path, self.frontend.install_mode_var.get(), components):
                         self.frontend.console_print('did not add remote, try again or try removing pre-existing install', color='red')
                         self.set_state(STATE_UNCONNECTED)
                         return
@@ -1315,7 +4267,20 @@ class Controller:
             self.set_state(STATE_NO_INSTALL)
 
 
+    def _schedule_maintenance(self):
+        """(Re)start the idle timer; maintenance runs when it fires without another button press."""
+        prev = getattr(self, '_maintenance_after_id', None)
+        if prev is not None:
+            self.frontend.root.after_cancel(prev)
+        self._maintenance_after_id = self.frontend.root.after(MAINTENANCE_IDLE_SECS * 1000, self._maintenance_when_idle)
+
+    def _maintenance_when_idle(self):
+        self._maintenance_after_id = None
+        if self.get_state() == STATE_CONNECTED:
+            threading.Thread(target=self.backend.run_maintenance, args=(self.frontend.path_var.get(),), daemon=True).start()
+
     def on_any_press(self, msg=None, clr='lime'):
+        self._schedule_maintenance()
         if msg is not None:
             self.frontend.console_print('msg', color=clr)
         if (False and self.get_state() == STATE_CONNECTED): # fix / remove
@@ -1332,11 +4297,33 @@ class Controller:
         if selected_path:
             self.frontend.path_var.set(selected_path)
 
+    def control_instances(self):
+        self.on_any_press()
+        path = Path(self.frontend.path_var.get())
+        if self.get_state() != STATE_CONNECTED:
+            self.frontend.console_print("Connect to an install first, new instances are made from it.", "orange")
+            return
+        def on_switch(new_path):
+            self.frontend.path_var.set(str(new_path))
+            self.control_confirm()
+        def on_create(name, dest, branch):
+            def _run():
+                try:
+                    self.backend.create_instance(path, name, dest, branch)
+                except Exception as e:
+                    self.frontend.console_print(f"Couldn't create instance: {e}", "red")
+                    return
+                self.frontend.path_var.set(str(dest))
+                self.control_confirm_internal()
+            self.backend.run_in_thread(_run)
+        self.frontend.open_instances_dialog(self.backend.list_instances(path), path, list(self.frontend.branch_dropdown["values"]), on_switch, on_create)
+
     def control_install(self):
         """Handler for the Install Modpack button."""
         self.on_any_press()
         path = Path(self.frontend.path_var.get())
-        self.backend.run_in_thread(self.install_modpack_internal, path)
+        mode = self.frontend.install_mode_var.get()
+        self.backend.run_in_thread(self.install_modpack_internal, path, mode)
 
     def control_update(self):
         self.on_any_press()
@@ -1356,12 +4343,39 @@ class Controller:
 
     def control_open(self):
         self.on_any_press()
-        self.backend.run_in_thread(self.control_open_internal)
+        self.backend.run_in_thread(self.control_open_internal, kind=TASK_FREE, name='open folder')
         
     def control_status(self):
-        self.backend.run_in_thread(self.backend.print_status_update, self.frontend.path_var.get(), True)
+        self.backend.run_in_thread(self.backend.print_status_update, self.frontend.path_var.get(), True, kind=TASK_READ, name='status')
+
+    def control_cancel(self):
+        # not through run_in_thread: it would queue behind the very task it's meant to stop
+        dropped, stopped = self.backend.cancel_tasks()
+        if dropped:
+            self.frontend.console_print(f"dropped {dropped} queued task(s)", "orange")
+        if stopped:
+            self.frontend.console_print("cancelling...", "orange")
+        elif not dropped:
+            self.frontend.console_print("no download running", "white")
+
+    def control_verify(self):
+        self.on_any_press()
+        path = self.frontend.path_var.get()
+        def _run():
+            if self.backend.check_repo(path):
+                self.frontend.console_print("verifying install files...", "yellow")
+                try:
+                    self.backend.verify_install(path)
+                except Exception as e:
+                    self.frontend.console_print(f"Verify failed: {e}", "red")
+        self.backend.run_in_thread(_run, kind=TASK_READ, name='verify')
 
     def launch_task(self):
+        # the bar follows the real steps: staged update, launcher lookup, launch
+        self.frontend.update_progress_bar(0, 3)
+        self._apply_staged_update(self.frontend.path_var.get())
+        self.frontend.update_progress_bar(1, 3)
+
         # Define the cache file path
         cache_file = os.path.join(self.frontend.path_var.get(), ".mc_launcher_path.cache")
         default_launcher_path = r"C:\Program Files (x86)\Minecraft Launcher\MinecraftLauncher.exe"
@@ -1405,32 +4419,72 @@ class Controller:
         self.frontend.console_print(f'found launcher at {launcher_path}', 'lime')
         with open(cache_file, "w") as f:
             f.write(launcher_path)
+        self.frontend.update_progress_bar(2, 3)
 
         # Launch the Minecraft Launcher
         try:
             self.frontend.console_print('running launcher..', 'yellow')
-            self.frontend.simulate_progress_bar(0.12)
+            self.backend.mark_launch(self.frontend.path_var.get())
+            launch_args = [launcher_path]
+            repo = self.backend.check_repo(self.frontend.path_var.get())
+            if repo is not None and self.backend.primary_path(repo).resolve() != Path(repo.working_tree_dir).resolve():
+                launch_args += ['--workDir', str(Path(repo.working_tree_dir).resolve())]  # instances aren't the launcher's default folder
+            subprocess.Popen(launch_args)
+            self.frontend.update_progress_bar(3, 3)
+            clicked = getattr(self, '_launch_clicked_at', None)
+            if clicked is not None:
+                self._launch_clicked_at = None
+                elapsed = time.monotonic() - clicked
+                print(f"click to launcher process: {elapsed:.3f}s")
+                self.frontend.console_print(f"have fun! (launched {elapsed:.2f}s after the click)")
+            else:
+                self.frontend.console_print('have fun!')
             self.frontend.console_print('shutting down to save resources...', 'yellow')
-            self.frontend.simulate_progress_bar(0.24)
-            self.frontend.console_print('have fun!')
-            subprocess.Popen([launcher_path])
-            time.sleep(1)
+            self._stage_update_while_playing(self.frontend.path_var.get())
+            self._maintain_while_playing(self.frontend.path_var.get())
             self.frontend.root.quit()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to launch Minecraft Launcher:\n{e}")
 
 
-    def _find_recent_crashes(self, minecraft_path):
+    def _find_recent_crashes(self, minecraft_path, since=None):
+        """Crash reports from the last CRASH_RECENT_WINDOW_SECS, or written after `since` if given."""
         crash_dir = Path(minecraft_path) / "crash-reports"
         if not crash_dir.exists():
             return []
-        now = time.time()
+        if since is None:
+            since = time.time() - CRASH_RECENT_WINDOW_SECS
         return sorted(
-            [f for f in crash_dir.iterdir() if f.is_file() and (now - f.stat().st_mtime) < CRASH_RECENT_WINDOW_SECS],
+            [f for f in crash_dir.iterdir() if f.is_file() and f.stat().st_mtime > since],
             key=lambda f: f.stat().st_mtime,
             reverse=True,
         )
 
+    def _settle_last_launch(self, repo, minecraft_path):
+        """The version launched last time becomes last-known-good if no crash report showed up since."""
+        try:
+            pending = self.backend.take_pending_launch(repo)
+            if pending is None:
+                return
+            sha, launched_at = pending
+            if self._find_recent_crashes(minecraft_path, since=launched_at):
+                good = self.backend.last_known_good(repo)
+                if good and good != repo.head.commit.hexsha:
+                    self.frontend.console_print(f"Your last launch crashed. 'rollback' goes back to {good[:7]}, the last version that worked.", "orange")
+            else:
+                self.backend.mark_known_good(repo, sha)
+        except Exception as e:
+            print(f"couldn't settle last launch: {e}")
+
+    def control_rollback(self):
+        self.on_any_press()
+        path = Path(self.frontend.path_var.get())
+        def _run():
+            repo = self.backend.check_repo(path)
+            if repo and self.backend.rollback_to_last_known_good(path):
+                self.backend.print_status_update(path)
+        self.backend.run_in_thread(_run)
+
     def _check_for_recent_crashes(self, minecraft_path):
         crashes = self._find_recent_crashes(minecraft_path)
         if crashes:
@@ -1456,6 +4510,60 @@ class Controller:
         if messagebox.askyesno("Crash Detected", msg):
             self._open_bug_report_dialog(minecraft_path, crash_files)
 
+    def control_settings(self):
+        minecraft_path = Path(self.frontend.path_var.get())
+        if not minecraft_path.exists():
+            self.frontend.console_print("Pick an existing minecraft folder before changing settings.", "orange")
+            return
+        def on_save(prefs):
+            _save_prefs(minecraft_path, prefs)
+            self.frontend.console_print("settings saved", "lime")
+            if self.get_state() == STATE_CONNECTED:
+                self.backend.update_lan_sharing(minecraft_path)
+        self.frontend.open_settings_dialog(_load_prefs(minecraft_path), on_save)
+
+    def _apply_staged_update(self, path):
+        """Swap in an update downloaded during the last session, if there is one."""
+        try:
+            if self.backend.apply_staged_update(path):
+                self.backend.remote.invalidate(path)
+        except Exception as e:
+            self.frontend.console_print(f"Couldn't apply staged update ({e}), use Update instead", "orange")
+
+    def _stage_update_while_playing(self, path):
+        """After launching: hide the window and download/stage the next update before exiting."""
+        prefs = _load_prefs(path)
+        if not prefs['stage_updates'] or not self.backend.check_repo(path):
+            return
+        self.frontend.root.after(0, self.frontend.root.withdraw)
+        try:
+            self.backend.stage_update(path, prefs['stage_rate_limit_kbps'])
+        except Exception as e:
+            print(f"staging failed: {e}")
+
+    def control_create_seed(self):
+        self.on_any_press()
+        path = Path(self.frontend.path_var.get())
+        if not self.backend.check_repo(path):
+            self.frontend.console_print("Connect to an install first, the seed is made from it.", "orange")
+            return
+        dest = fd.asksaveasfilename(title="Save seed bundle", initialdir=str(_launcher_dir()), initialfile=SEED_BUNDLE_NAME,
+                                    defaultextension=".bundle", filetypes=[("Git bundle", "*.bundle")])
+        if not dest:
+            return
+        self.backend.run_in_thread(self.backend.create_seed_bundle, path, dest, priority=TASK_PRIORITY_LOW, name='seed bundle')
+
+    def _maintain_while_playing(self, path):
+        """After launching, with the window hidden: repo maintenance if it's due (launch_task is a write task, so it has the repo)."""
+        try:
+            repo = git.Repo(path)
+            if not self.backend.maintenance_due(repo):
+                return
+        except Exception:
+            return
+        self.frontend.root.after(0, self.frontend.root.withdraw)
+        self.backend.run_maintenance(path, locked=True)
+
     def control_bug_report(self):
         minecraft_path = Path(self.frontend.path_var.get())
         crashes = self._find_recent_crashes(minecraft_path) if minecraft_path.exists() else []
@@ -1543,7 +4651,8 @@ class Controller:
             subject = subject_var.get().strip() or "problem"
             user_msg = msg_text.get("1.0", tk.END).strip()
             dialog.destroy()
-            self.backend.run_in_thread(self._send_bug_report, minecraft_path, subject, user_msg, crash_files or [], username, list(selected_screenshots), list(selected_extra_logs))
+            self.backend.run_in_thread(self._send_bug_report, minecraft_path, subject, user_msg, crash_files or [], username, list(selected_screenshots), list(selected_extra_logs),
+                                       kind=TASK_FREE, name='bug report')
 
         tk.Button(btn_frame, text="Send Report", bg="#c06060", fg="white", font=FONT_TEXT, width=14, height=1, command=on_send).pack(side=tk.LEFT, padx=8)
         tk.Button(btn_frame, text="Cancel", font=FONT_TEXT, width=14, height=1, command=dialog.destroy).pack(side=tk.LEFT, padx=8)
@@ -1618,16 +4727,30 @@ class Controller:
         path = Path(self.frontend.path_var.get())
         self.frontend.console_print("Running blind launch..", "yellow")
         self.frontend.console_print("Checking for tracked install..", "yellow")
-        self.frontend.simulate_progress_bar(0.22)
         repo = self.backend.check_repo(path)
         if repo:
+            self._settle_last_launch(repo, path)
+            if _load_prefs(path)['fast_launch']:
+                self.frontend.console_print("fast launch: checking for updates in the background", "yellow")
+                self.backend.fetch_in_background(path)
+                self.launch_task()
+                return
             try:
                 branch = repo.active_branch.name
-                repo.remotes.origin.fetch()
-                local = repo.head.commit
-                remote = repo.remotes.origin.refs[branch].commit
                 self.frontend.console_print("Got an install! Checking if up to date:", "lime")
-                if local != remote:
+                try:
+                    remote_sha = self.backend.ls_remote_head(repo, branch)
+                except LookupError:
+                    self.frontend.console_print(f"Branch '{branch}' isn't on the remote anymore -- stopping and connecting, pick another branch", "orange")
+                    self.update_dropdown()
+                    self.set_state(STATE_CONNECTED)
+                    return
+                if remote_sha is None:
+                    self.frontend.console_print("Remote didn't answer in time, launching now (checking for updates in the background)", "orange")
+                    self.backend.fetch_in_background(path)
+                    self.launch_task()
+                    return
+                if repo.head.commit.hexsha != remote_sha:
                     self.frontend.console_print("Looks like there's an update -- stopping and connecting", "orange")
                     self.update_dropdown()
                     self.set_state(STATE_CONNECTED)
@@ -1641,10 +4764,11 @@ class Controller:
         self.launch_task()
 
     def control_launch(self):
+        self._launch_clicked_at = time.monotonic()  # launch_task reports click -> launcher process time
         if self.get_state() == STATE_UNCONNECTED:
-            self.backend.run_in_thread(self.blind_launch_task)
+            self.backend.run_in_thread(self.blind_launch_task, priority=TASK_PRIORITY_HIGH)
         else:
-            self.backend.run_in_thread(self.launch_task)
+            self.backend.run_in_thread(self.launch_task, priority=TASK_PRIORITY_HIGH)
 
 
 